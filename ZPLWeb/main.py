@@ -1,22 +1,45 @@
 """GUI application for printing ZPL labels received via socket.io."""
 
+import ctypes
 import datetime as dt
+import logging
+import logging.handlers
+import os
+import queue
+import random
 import sqlite3
 import sys
+import time
+import zlib
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from ctypes import wintypes
+from dataclasses import dataclass
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from threading import Thread
-from typing import Any, Callable
+from threading import Lock, Thread
+from typing import Any, Callable, Iterator
 
 import socketio
 from appdirs import user_data_dir
-from PySide6.QtCore import QEventLoop, QSettings, Qt, QTimer, Signal, Slot
-from PySide6.QtGui import QCloseEvent, QIcon
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QSettings,
+    Qt,
+    QThreadPool,
+    QTimer,
+    Signal,
+    Slot,
+)
+from PySide6.QtGui import QCloseEvent, QIcon, QTextCursor
 from PySide6.QtWidgets import (
     QApplication,
     QDialog,
     QLabel,
     QLineEdit,
-    QListWidget,
+    QListView,
     QMainWindow,
     QMessageBox,
     QPushButton,
@@ -29,7 +52,12 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from ZPLWeb.utils import ensure_single_instance, resource_path, _make_fingerprint
+from ZPLWeb.utils import (
+    ensure_single_instance,
+    expire_stale_jobs,
+    resource_path,
+    _make_fingerprint,
+)
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Platform‑specific printer import
@@ -39,29 +67,297 @@ if sys.platform.startswith("win"):
 else:
     win32print = None  # allow the file to import on non‑Windows hosts
 
+# winspool's WritePrinter via ctypes reads straight from the bytes buffer;
+# pywin32's wrapper copies it first. Fall back to pywin32 if unavailable.
+try:
+    _WritePrinter = ctypes.WinDLL("winspool.drv").WritePrinter
+    _WritePrinter.argtypes = [
+        wintypes.HANDLE,
+        ctypes.c_void_p,
+        wintypes.DWORD,
+        ctypes.POINTER(wintypes.DWORD),
+    ]
+    _WritePrinter.restype = wintypes.BOOL
+except (AttributeError, OSError):  # no WinDLL off Windows
+    _WritePrinter = None
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Constants & defaults
 # ──────────────────────────────────────────────────────────────────────────────
 SERVER_URL = "https://colemanbros.co.uk"
 DEFAULT_PRINTER = r"\\office-02\\ZPL500"
 SETTINGS_SCOPE = ("ColemanAgent", "PrintAgent")
+RECONNECT_MIN_MS = 1000  # first retry delay after a dropped connection
+RECONNECT_MAX_MS = 60_000  # backoff ceiling
+CONNECT_TIMEOUT_S = 5  # wait for the namespace CONNECT ack before giving up
+RECONNECT_JITTER = 0.5  # ± fraction applied to each retry delay
+PRINTER_IDLE_S = 300  # close the cached printer handle after this long unused
+LOG_MAX_LINES = 5000  # oldest log lines are dropped past this
+LOG_FLUSH_MS = 50  # max delay between a log line and its flush to the widget
+API_KEY_MAX_LEN = 256  # longer values are a paste accident, not a key
+MAX_ZPL_BYTES = 32 * 1024 * 1024  # refuse labels larger than this
+WRITE_CHUNK_BYTES = 256 * 1024  # WritePrinter slice size for large labels
+PRINT_QUEUE_SIZE = 64  # pending print work; further jobs are dropped, not acked
+PRINT_STOP_TIMEOUT_S = 10  # wait on close for the label being printed
+PRINT_BATCH_MAX = 16  # queued labels merged into one spooler document
+# extra wait for follow-up labels before printing a batch; 0 only merges jobs
+# that are already queued, so a lone label is never delayed
+try:
+    PRINT_BATCH_S = max(0, int(os.environ.get("ZPLWEB_BATCH_MS", "0"))) / 1000
+except ValueError:  # malformed override; keep the no-wait default
+    PRINT_BATCH_S = 0.0
+ACK_BATCH_SIZE = 500  # job ids per UPDATE ... IN (...) statement
+
+# Local print history; bump DB_VERSION and extend MainWindow._migrate_db when
+# the schema changes.
+DB_VERSION = 2
+# per-connection settings, applied to both the read/write and read-only handle
+_DB_PRAGMAS = """
+PRAGMA busy_timeout=5000;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-65536;
+"""
+_DB_SCHEMA = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS prints (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id   INTEGER,
+    invoice  TEXT,
+    pcs      INTEGER,
+    zpl      BLOB,
+    tstamp   TEXT,
+    acked    INTEGER DEFAULT 0,
+    zpl_codec INTEGER DEFAULT 0  -- see _pack_zpl
+);
+-- job_id / invoice lookups use ORDER BY id DESC LIMIT 1
+CREATE INDEX IF NOT EXISTS ix_prints_job_id ON prints(job_id);
+CREATE INDEX IF NOT EXISTS ix_prints_invoice_id ON prints(invoice, id DESC);
+COMMIT;
+"""
+logger = logging.getLogger(__name__)
 
 # Helper to load / save settings
 S = QSettings(*SETTINGS_SCOPE)
 
+# per-packet socket.io / engine.io logging; only wanted while debugging
+DEBUG = bool(os.environ.get("ZPLWEB_DEBUG")) or S.value("debug", False, type=bool)
+# persisted keys and their defaults, read together by _read_prefs()
+_PREF_DEFAULTS: dict[str, Any] = {
+    "api_key": "",
+    "printer_name": DEFAULT_PRINTER,
+    "server_url": SERVER_URL,
+    "write_chunk_bytes": WRITE_CHUNK_BYTES,
+    "reconnect_min_ms": RECONNECT_MIN_MS,
+    "reconnect_max_ms": RECONNECT_MAX_MS,
+    "reconnect_jitter": RECONNECT_JITTER,
+}
+
+
+def _sanitize_key(raw: str) -> str:
+    """Return ``raw`` without surrounding whitespace, capped in length."""
+    return raw.strip()[:API_KEY_MAX_LEN]
+
+
+def _read_prefs() -> dict[str, Any]:
+    """Return every persisted preference, refreshed from storage once.
+
+    Text values are cleaned and numbers converted here so callers can use
+    them as-is; a number that doesn't parse falls back to its default.
+    """
+    S.sync()
+    prefs = {key: S.value(key, default) for key, default in _PREF_DEFAULTS.items()}
+    for key, default in _PREF_DEFAULTS.items():
+        if isinstance(default, (int, float)):
+            try:
+                prefs[key] = type(default)(prefs[key])
+            except (TypeError, ValueError):  # hand-edited or corrupt setting
+                prefs[key] = default
+    prefs["api_key"] = _sanitize_key(prefs["api_key"])
+    prefs["server_url"] = prefs["server_url"].strip()
+    return prefs
+
+
+# seeded from os.urandom so agents started together don't share a sequence
+_RNG = random.SystemRandom()
+
 # -----------------------------------------------------------------------------
 # Printing util (thread‑safe)
 # -----------------------------------------------------------------------------
 
 
-def wait_ms(ms: int):
-    loop = QEventLoop()
-    QTimer.singleShot(ms, loop.quit)
-    loop.exec()  # blocks here, but UI remains responsive
+class _PrinterSession:
+    """Printer handle kept open between jobs.
+
+    ``OpenPrinter``/``ClosePrinter`` are spooler round-trips (over SMB for a
+    shared network printer), so the handle is reused until the printer name
+    changes, a job fails or it sits idle for ``idle_seconds``, at which point
+    it is reopened lazily.
+    """
+
+    def __init__(
+        self,
+        idle_seconds: float = PRINTER_IDLE_S,
+        chunk_size: int = WRITE_CHUNK_BYTES,
+    ) -> None:
+        self._lock = Lock()
+        self._name: str | None = None
+        self._handle = None
+        self._idle_seconds = idle_seconds
+        self._last_used = 0.0
+        self.chunk_size = chunk_size
+
+    def _open(self, printer_name: str):
+        if self._handle is None or self._name != printer_name:
+            self._close()
+            self._handle = win32print.OpenPrinter(printer_name)
+            self._name = printer_name
+        return self._handle
+
+    def _close(self) -> None:
+        if self._handle is not None:
+            try:
+                win32print.ClosePrinter(self._handle)
+            except Exception:  # pylint: disable=broad-except
+                pass
+        self._handle = None
+        self._name = None
+
+    def send(self, printer_name: str, data: bytes) -> None:
+        """Write ``data`` to ``printer_name`` as a single RAW document."""
+        with self._lock:
+            handle = self._open(printer_name)
+            try:
+                win32print.StartDocPrinter(handle, 1, ("ZPL", None, "RAW"))
+                win32print.StartPagePrinter(handle)
+                self._write(handle, data)
+                win32print.EndPagePrinter(handle)
+                win32print.EndDocPrinter(handle)
+            except Exception:
+                self._close()  # handle may be stale; reopen on the next job
+                raise
+            finally:
+                self._last_used = time.monotonic()
+
+    def _write(self, handle, data: bytes) -> None:
+        """Hand ``data`` to the spooler in ``chunk_size`` slices."""
+        size = self.chunk_size
+        if _WritePrinter is not None:
+            # pointer into the immutable bytes object: no per-slice copies
+            base = ctypes.cast(ctypes.c_char_p(data), ctypes.c_void_p).value
+            written = wintypes.DWORD()
+            start = 0
+            while start < len(data):
+                n = min(size, len(data) - start)
+                ok = _WritePrinter(int(handle), base + start, n, ctypes.byref(written))
+                if not ok:
+                    raise ctypes.WinError()
+                if not written.value:
+                    raise OSError("WritePrinter accepted no data")
+                start += written.value  # the spooler may take a partial slice
+            return
+        if len(data) <= size:
+            win32print.WritePrinter(handle, data)
+            return
+        view = memoryview(data)
+        for start in range(0, len(view), size):
+            win32print.WritePrinter(handle, bytes(view[start : start + size]))
+
+    def close(self) -> None:
+        """Release the handle now; the next job reopens it."""
+        with self._lock:
+            self._close()
+
+    def close_if_idle(self, now: float | None = None) -> None:
+        """Release the handle if no job has used it for ``idle_seconds``."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._handle is not None and now - self._last_used > self._idle_seconds:
+                self._close()
+
+
+_PRINTER = _PrinterSession()
+
+
+@dataclass(frozen=True, slots=True)
+class PrintJob:
+    """A validated ``print_label`` payload."""
+
+    job_id: int | None = None
+    invoice: str | None = None
+    pcs: int | None = None
+    data: str | bytes = b""
+
+    @classmethod
+    def from_payload(cls, payload: Any) -> "PrintJob":
+        """Build a job from the decoded socket.io message.
+
+        A missing or unparsable ``pcs`` becomes ``None`` (shown as one copy)
+        rather than rejecting a label that can still be printed.
+
+        Raises:
+            TypeError: If the payload or its ZPL has the wrong type.
+            ValueError: If ``job_id`` is not an integer.
+        """
+        if not isinstance(payload, dict):
+            raise TypeError(f"expected an object, got {type(payload).__name__}")
+        job_id, invoice, pcs = (payload.get(k) for k in ("job_id", "invoice", "pcs"))
+        data = payload.get("data") or b""
+        if isinstance(data, bytearray):
+            data = bytes(data)
+        if not isinstance(data, (str, bytes)):
+            raise TypeError(f"ZPL must be text or bytes, got {type(data).__name__}")
+        if isinstance(job_id, float) and not job_id.is_integer():
+            raise ValueError(f"job_id must be an integer, got {job_id!r}")
+        try:
+            pcs = int(pcs) if pcs else None
+        except (TypeError, ValueError):
+            pcs = None
+        return cls(
+            job_id=int(job_id) if job_id else None,
+            invoice=None if invoice is None else str(invoice),
+            pcs=pcs,
+            data=data,
+        )
+
+
+# zpl_codec values stored next to each blob; never renumber or change the
+# dictionary of an existing codec, old rows depend on it
+ZPL_RAW = 0
+ZPL_ZLIB = 1  # zlib with _ZPL_ZDICT as the preset dictionary
+# common ZPL commands, most frequent last as zlib prefers
+_ZPL_ZDICT = (
+    b"^CI28^PW^LL^LH0,0^MMT^MNY^PON^PMN^JMA^LRN^MD0^PR4,4~SD15^LS0"
+    b"^BY2,3^BCN,100,Y,N,N^BQN,2,5^GB^GFA,^FR^FB^FH\\^A0N,^CF0,"
+    b"^PQ1,0,1,Y^XZ^XA^FO^FS^FD^FS^FO^A0N,30,30^FD^FS^FO^FD^FS^XZ^XA"
+)
+
+
+def _pack_zpl(zpl: bytes) -> tuple[bytes, int]:
+    """Compress ``zpl`` for storage, returning the blob and its codec."""
+    c = zlib.compressobj(6, zdict=_ZPL_ZDICT)
+    blob = c.compress(zpl) + c.flush()
+    return (blob, ZPL_ZLIB) if len(blob) < len(zpl) else (zpl, ZPL_RAW)
+
+
+def _unpack_zpl(blob: str | bytes | None, codec: int | None) -> bytes:
+    """Reverse :func:`_pack_zpl` for a stored row."""
+    if codec == ZPL_ZLIB:
+        d = zlib.decompressobj(zdict=_ZPL_ZDICT)
+        return d.decompress(blob) + d.flush()
+    return _zpl_bytes(blob)  # rows from before compression, or incompressible
+
+
+def _zpl_bytes(zpl: str | bytes | None) -> bytes:
+    """Return a ZPL payload as bytes, encoding text as UTF-8 exactly once."""
+    if isinstance(zpl, str):
+        return zpl.encode("utf-8")
+    return zpl or b""
 
 
 def _print_zpl(
-    printer_name: str, zpl_string: str, cb: Callable[[bool, str], Any]
+    printer_name: str, zpl: bytes, cb: Callable[[bool, str], Any]
 ) -> None:
     """Send ZPL to the given printer.
 
@@ -70,24 +366,20 @@ def _print_zpl(
 
     Args:
         printer_name: Target printer queue name.
-        zpl_string: Raw ZPL command string.
+        zpl: Raw ZPL commands, already encoded.
         cb: Callback receiving ``(success, message)``.
     """
     if not win32print:
         return cb(True, f"Skipped printed via {printer_name}")
 
     try:
-        handle = win32print.OpenPrinter(printer_name)
-        win32print.StartDocPrinter(handle, 1, ("ZPL", None, "RAW"))
-        win32print.StartPagePrinter(handle)
-        win32print.WritePrinter(handle, zpl_string.encode("utf-8"))
-        win32print.EndPagePrinter(handle)
-        win32print.EndDocPrinter(handle)
-        win32print.ClosePrinter(handle)
-        cb(True, f"Printed via {printer_name}")
+        _PRINTER.send(printer_name, zpl)
     except Exception as exc:  # pylint: disable=broad-except
-
+        logger.exception("Print to %s failed", printer_name)
         return cb(False, f"Print error: {exc}")
+    # outside the try: a failing callback must not report a printed label
+    # as a print error
+    cb(True, f"Printed via {printer_name}")
 
 
 # -----------------------------------------------------------------------------
@@ -101,17 +393,19 @@ class OptionsDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Options")
 
+        prefs = self._prefs = _read_prefs()  # compared against on save
+
         self.api_edit = QLineEdit(self)
         self.api_edit.setPlaceholderText("API key")
-        self.api_edit.setText(S.value("api_key", ""))
+        self.api_edit.setText(prefs["api_key"])
 
         self.prn_edit = QLineEdit(self)
         self.prn_edit.setPlaceholderText("Printer name, e.g. \\host\\queue")
-        self.prn_edit.setText(S.value("printer_name", DEFAULT_PRINTER))
+        self.prn_edit.setText(prefs["printer_name"])
 
         self.server_edit = QLineEdit(self)
         self.server_edit.setPlaceholderText("Server URL")
-        self.server_edit.setText(S.value("server_url", SERVER_URL))
+        self.server_edit.setText(prefs["server_url"])
 
         save_btn = QPushButton("Save", self)
         save_btn.clicked.connect(self._save)
@@ -134,22 +428,39 @@ class OptionsDialog(QDialog):
         if not api_key or not prn:
             QMessageBox.warning(self, "Options", "Both fields are required")
             return
+        if len(api_key) > API_KEY_MAX_LEN or any(c.isspace() for c in api_key):
+            QMessageBox.warning(
+                self,
+                "Options",
+                f"The API key must be a single word of at most {API_KEY_MAX_LEN} "
+                "characters",
+            )
+            return
 
-        S.setValue("api_key", api_key)
-        S.setValue("printer_name", prn)
-        S.setValue("server_url", svr)  # <── consistent key
+        entered = {"api_key": api_key, "printer_name": prn, "server_url": svr}
+        changed = {k: v for k, v in entered.items() if v != self._prefs[k]}
+        for key, value in changed.items():
+            S.setValue(key, value)
+        if changed:
+            S.sync()
         self.accept()
 
 
 class TestPrintDialog(QDialog):
     """Light-weight dialog to paste ZPL and send a one-off test print."""
 
+    result_sig = Signal(bool, str)  # print outcome, emitted from the worker
+
     def __init__(
-        self, parent: QDialog | None = None, printer_name: str | None = None
+        self,
+        parent: QDialog | None = None,
+        printer_name: str | None = None,
+        submit: Callable[..., bool] | None = None,
     ) -> None:
         super().__init__(parent)
         self.setWindowTitle("Test ZPL Print")
         self.printer_name = printer_name
+        self.submit = submit  # queues onto the shared print worker, if given
 
         self.text_edit = QTextEdit(self)
         self.text_edit.setAcceptRichText(False)
@@ -159,6 +470,7 @@ class TestPrintDialog(QDialog):
 
         send_btn = QPushButton("Print", self)
         send_btn.clicked.connect(self._do_print)
+        self.result_sig.connect(self._show_result, Qt.QueuedConnection)
 
         lay = QVBoxLayout(self)
         lay.addWidget(self.text_edit)
@@ -173,18 +485,66 @@ class TestPrintDialog(QDialog):
             QMessageBox.warning(self, "Test ZPL Print", "Please enter some ZPL.")
             return
 
-        def cb(ok: bool, msg: str) -> None:
-            def show_result() -> None:  # runs later in GUI thread
-                self.status_lbl.setText(msg)
-                parent = self if ok else self.parent()
-                QMessageBox.information(parent, "Test ZPL Print", msg)
+        # run the actual I/O off the GUI thread; queue behind live jobs on the
+        # main window's print worker rather than racing it on a new thread
+        args = (self.printer_name, _zpl_bytes(zpl), self.result_sig.emit)
+        if self.submit is None:
+            QThreadPool.globalInstance().start(partial(_print_zpl, *args))
+        elif not self.submit(_print_zpl, *args):
+            self._show_result(False, "Print queue is full; try again shortly.")
+
+    @Slot(bool, str)
+    def _show_result(self, ok: bool, msg: str) -> None:
+        """Report the print outcome; runs in the GUI thread."""
+        self.status_lbl.setText(msg)
+        parent = self if ok else self.parent()
+        QMessageBox.information(parent, "Test ZPL Print", msg)
+
 
-            QTimer.singleShot(0, show_result)  # hop to GUI thread
+# -----------------------------------------------------------------------------
+# Print history model
+# -----------------------------------------------------------------------------
+class PrintHistoryModel(QAbstractListModel):
+    """Newest-first list of printed invoices, capped at ``maxlen`` rows.
 
-        # run the actual I/O in a worker thread
-        Thread(
-            target=_print_zpl, args=(self.printer_name, zpl, cb), daemon=True
-        ).start()
+    New prints are prepended in O(1) and the view only paints visible rows,
+    unlike ``QListWidget.insertItem(0, ...)`` which shifts every item.
+    """
+
+    def __init__(self, maxlen: int = 5000, parent=None) -> None:
+        super().__init__(parent)
+        self._rows: deque[str] = deque(maxlen=maxlen)
+
+    @property
+    def maxlen(self) -> int:
+        """Most rows the model keeps."""
+        return self._rows.maxlen
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if role == Qt.DisplayRole and index.isValid():
+            return self._rows[index.row()]
+        return None
+
+    def prepend(self, text: str) -> None:
+        """Insert ``text`` at the top, dropping the oldest row when full."""
+        if len(self._rows) == self._rows.maxlen:
+            last = len(self._rows) - 1
+            self.beginRemoveRows(QModelIndex(), last, last)
+            self._rows.pop()
+            self.endRemoveRows()
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self._rows.appendleft(text)
+        self.endInsertRows()
+
+    def reset(self, rows: list[str]) -> None:
+        """Replace all rows (given newest-first) in a single model reset."""
+        self.beginResetModel()
+        self._rows.clear()
+        self._rows.extend(islice(rows, self._rows.maxlen))
+        self.endResetModel()
 
 
 # -----------------------------------------------------------------------------
@@ -192,12 +552,15 @@ class TestPrintDialog(QDialog):
 # -----------------------------------------------------------------------------
 class MainWindow(QMainWindow):
     log_sig = Signal(str)
+    _log_wake = Signal()  # first line buffered since the last flush
     status_sig = Signal(str)
-    ack_sig = Signal(int)  # job_id to ack
     _reconnect = Signal()
     gui_connected = Signal()
     gui_disconnected = Signal()
     add_print_sig = Signal(str, int, str)  # invoice, copies, timestamp
+    history_loaded = Signal(list)  # list rows, newest first
+
+    _icon_cache: dict[QStyle.StandardPixmap, QIcon] = {}  # shared by all windows
 
     # .........................................................................
     def __init__(self) -> None:
@@ -207,8 +570,14 @@ class MainWindow(QMainWindow):
         self.resize(650, 450)
 
         self.splitter = QSplitter(Qt.Horizontal, self)
-        self.list = QListWidget()
+        self.history = PrintHistoryModel(parent=self)
+        self.list = QListView()
+        self.list.setModel(self.history)
+        self.list.setUniformItemSizes(True)
         self.out = QTextEdit(readOnly=True)
+        self.out.document().setMaximumBlockCount(LOG_MAX_LINES)
+        self.out.setUndoRedoEnabled(False)  # read-only log; don't keep every insert
+        self.out.setLineWrapMode(QTextEdit.NoWrap)  # no re-wrap on resize
 
         self.splitter.addWidget(self.list)
         self.splitter.addWidget(self.out)
@@ -219,19 +588,12 @@ class MainWindow(QMainWindow):
 
         self.setCentralWidget(self.splitter)
 
-        # initial sizes once layout is settled
-        QTimer.singleShot(
-            0,
-            lambda: self.splitter.setSizes(
-                [
-                    int(self.splitter.width() * 0.25),
-                    int(self.splitter.width() * 0.75),
-                ]
-            ),
-        )
+        # initial 25/75 split; set before show() the values act as proportions
+        # and are scaled to the real width, so no deferred re-layout is needed
+        self.splitter.setSizes([1000, 3000])
 
         self.reprint_btn = QToolButton(self)
-        self.reprint_btn.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
+        self.reprint_btn.setIcon(self._std_icon(QStyle.SP_MediaPlay))
         self.reprint_btn.setToolTip("Re-print selected invoice")
         self.reprint_btn.clicked.connect(self._reprint_selected)
 
@@ -239,11 +601,12 @@ class MainWindow(QMainWindow):
         self.reprint_label.setStyleSheet("font-weight:bold; margin:5px;")
 
         self.stat = QLabel("Disconnected")
+        self._status_text = "Disconnected"  # last value sent via status_sig
         self.stat.setStyleSheet("font-weight:bold; margin:5px;")
 
         # manual reconnect button
         self.re_btn = QToolButton(self)
-        self.re_btn.setIcon(self.style().standardIcon(QStyle.SP_BrowserReload))
+        self.re_btn.setIcon(self._std_icon(QStyle.SP_BrowserReload))
         self.re_btn.setToolTip("Reconnect to server now")
         self.re_btn.clicked.connect(self._manual_reconnect)
         self.re_btn.setEnabled(True)  # enabled while we are disconnected
@@ -261,134 +624,220 @@ class MainWindow(QMainWindow):
         self.statusBar().addPermanentWidget(self.stat)
         # request outstanding labels button
         self.missing_btn = QToolButton(self)
-        self.missing_btn.setIcon(self.style().standardIcon(QStyle.SP_DialogResetButton))
+        self.missing_btn.setIcon(self._std_icon(QStyle.SP_DialogResetButton))
         self.missing_btn.setToolTip("Request outstanding labels from server")
         self.missing_btn.clicked.connect(self._request_missing)
         self.statusBar().addPermanentWidget(self.missing_btn)
         self.statusBar().addPermanentWidget(self.re_btn)
 
-        self._seen_jobs: set[int] = set()  # de-dupe tracker
-        self._init_db()  # create DB + load history
-
-        self._load_history()  # ← add this line
+        self._init_db()  # create DB
+        self._bg_pool = QThreadPool(self)  # off-GUI-thread DB reads
 
         self._build_menu()
 
         # -- data --------------------------------------------------------------
         self._load_prefs()
 
+        # -- printing ----------------------------------------------------------
+        # one persistent worker behind a bounded queue: the socket reader
+        # hands jobs off and keeps reading, and a flood can't grow memory
+        self._print_q: queue.Queue = queue.Queue(maxsize=PRINT_QUEUE_SIZE)
+        self._print_thread = Thread(
+            target=self._print_worker, name="zpl-print", daemon=True
+        )
+        self._print_thread.start()
+        # drop the spooler handle once idle; the check runs on the worker so
+        # it never blocks the GUI or lands in the middle of a job
+        self._printer_idle_timer = QTimer(self)
+        self._printer_idle_timer.setInterval(PRINTER_IDLE_S * 1000 // 2)
+        self._printer_idle_timer.timeout.connect(
+            lambda: self._submit(_PRINTER.close_if_idle)
+        )
+        self._printer_idle_timer.start()
+
         # -- socket ------------------------------------------------------------
         self.sio = socketio.Client(  # auto reconnect off (we handle it)
             reconnection=False,
-            logger=True,  # <── add
-            engineio_logger=True,  # <── add
+            handle_sigint=False,  # Qt owns the process lifecycle
+            logger=DEBUG,
+            engineio_logger=DEBUG,
         )
         self._register_handlers()
         QTimer.singleShot(0, self._connect_socket)
 
         # -- signals connect ---------------------------------------------------
-        self.log_sig.connect(self._log, Qt.QueuedConnection)
+        # log lines are buffered on the emitting thread and flushed to the
+        # widget at most once per timer interval
+        self._log_lock = Lock()
+        self._log_buf: deque[str] = deque()
+        self._ts_cache = (0, "")  # (epoch second, "[HH:MM:SS] ")
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(LOG_FLUSH_MS)
+        self._log_timer.timeout.connect(self._flush_log)
+        self._log_wake.connect(self._log_timer.start, Qt.QueuedConnection)
+        self.log_sig.connect(self._log, Qt.DirectConnection)
         self.status_sig.connect(self.stat.setText, Qt.QueuedConnection)
         self.gui_connected.connect(self._on_gui_connected, Qt.QueuedConnection)
         self.gui_disconnected.connect(self._on_gui_disconnected, Qt.QueuedConnection)
-        self.ack_sig.connect(self._emit_ack, Qt.QueuedConnection)
         self.add_print_sig.connect(self._add_print_to_list, Qt.QueuedConnection)
-
-        # label de dupe
-        from threading import Lock
-
+        self.history_loaded.connect(self.history.reset, Qt.QueuedConnection)
+
+        # read history once the window is up rather than before show(); the
+        # timer is parented so closeEvent can cancel it
+        self._closing = False
+        self._history_timer = QTimer(self)
+        self._history_timer.setSingleShot(True)
+        self._history_timer.timeout.connect(self._load_history)
+        self._history_timer.start(0)
+
+        # label de dupe; _inflight and _recent_fingerprints are only touched
+        # by the print worker, _job_lock guards _recent_jobs, which acks
+        # flushed on (re)connect also update from the socket thread
         self._job_lock = Lock()
         self._inflight: set[int] = set()  # jobs currently being printed
-        self._recent_fingerprints: dict[str, float] = (
-            {}
-        )  # fingerprint -> last seen timestamp (for job_id-less jobs)
+        # job_id -> acked for recently seen jobs; older ones are looked up in
+        # the DB (indexed on job_id) instead of being preloaded at startup
+        self._recent_jobs: OrderedDict[int, bool] = OrderedDict()
+        self._recent_jobs_cap = 4096
+        # fingerprint -> last seen monotonic time (for job_id-less jobs),
+        # kept oldest-first so expiry only walks the stale prefix
+        self._recent_fingerprints: OrderedDict[int, float] = OrderedDict()
         self._fingerprint_ttl = 60  # seconds window to suppress duplicates for unlabeled jobs
+        self._fingerprint_cap = 1024  # bound memory under a flood of unlabeled jobs
 
         # automatic reconnect support
         self._connecting = False
+        self._attempt = 0  # failed attempts since the last good connection
         self._reconnect_timer = QTimer(self)
-        self._reconnect_timer.setInterval(5000)  # 5s retry
+        self._reconnect_timer.setSingleShot(True)
         self._reconnect_timer.timeout.connect(self._reconnect_tick)
 
-        # allow options-triggered reconnect
-        self._reconnect.connect(self._connect_socket)
+        # allow options-triggered reconnect; only emitted on the GUI thread
+        self._reconnect.connect(self._connect_socket, Qt.DirectConnection)
+
+    def _std_icon(self, pixmap: QStyle.StandardPixmap) -> QIcon:
+        """Return the style's standard icon, looked up once per process."""
+        icon = self._icon_cache.get(pixmap)
+        if icon is None:
+            icon = self._icon_cache[pixmap] = self.style().standardIcon(pixmap)
+        return icon
 
     def _load_history(self) -> None:
-        """Populate the left-hand list from the existing DB rows."""
-        self.list.clear()  # start with a clean slate
-        with sqlite3.connect(self._db_path) as con:
-            for invoice, pcs, ts in con.execute(
-                "SELECT invoice, pcs, tstamp FROM prints ORDER BY id DESC"
-            ):
-                self._add_print_to_list(invoice, pcs, ts)
+        """Populate the left-hand list from the DB without blocking the GUI."""
+        if not self._closing:  # the DB handles are closed on shutdown
+            self._bg_pool.start(self._fetch_history)
+
+    def _fetch_history(self) -> None:
+        """Read the history rows on a pool thread and hand them to the GUI."""
+        # only as many rows as the model keeps; the rest would be discarded
+        rows = self._db_ro.execute(
+            "SELECT invoice, pcs FROM prints ORDER BY id DESC LIMIT ?",
+            (self.history.maxlen,),
+        ).fetchall()
+        # rows are newest-first already, matching live prints added at the top
+        self.history_loaded.emit([f"{inv}  x{pcs or 1}" for inv, pcs in rows])
 
     def _add_print_to_list(self, invoice: str, pcs: int, ts: str) -> None:
-        self.list.insertItem(0, f"{invoice}  x{pcs or 1}")
+        self.history.prepend(f"{invoice}  x{pcs or 1}")
 
     def _reprint_selected(self) -> None:
-        row = self.list.currentRow()
-        if row < 0:
+        index = self.list.currentIndex()
+        if not index.isValid():
             return
-        invoice_line = self.list.item(row).text()
+        invoice_line = index.data()
         invoice = invoice_line.split("  x")[0].strip()
 
-        with sqlite3.connect(self._db_path) as con:
-            row = con.execute(
-                (
-                    "SELECT zpl, pcs FROM prints "
-                    "WHERE invoice=? ORDER BY id DESC LIMIT 1"
-                ),
-                (invoice,),
-            ).fetchone()
-
+        row = self._last_print(invoice)
         if not row:
             QMessageBox.warning(self, "Re-print", "ZPL not found for that invoice")
             return
 
         zpl, copies = row
         self.log_sig.emit(f"Re-printing {invoice} x{copies or 1}…")
-        Thread(
-            target=_print_zpl,
-            args=(self.printer_name, zpl, lambda *_: None),
-            daemon=True,
-        ).start()
+        if not self._submit(_print_zpl, self.printer_name, zpl, lambda *_: None):
+            self.log_sig.emit("Print queue is full; re-print dropped.")
+
+    def _last_print(self, invoice: str) -> tuple[bytes, int | None] | None:
+        """Return the ZPL and copies of the latest print for ``invoice``."""
+        row = self._db_ro.execute(
+            "SELECT zpl, zpl_codec, pcs FROM prints WHERE invoice=? "
+            "ORDER BY id DESC LIMIT 1",
+            (invoice,),
+        ).fetchone()
+        if row is None:
+            return None
+        blob, codec, pcs = row
+        return _unpack_zpl(blob, codec), pcs
 
     def _init_db(self) -> None:
-        """Create the SQLite DB (if missing) and load printed job IDs.
+        """Create the SQLite DB (if missing) and open the shared connections.
 
         The database keeps a persistent record of all print jobs so we can
         de-duplicate requests across restarts. From this patch onward we also
         track whether a job has been acknowledged back to the server.
+
+        Two long-lived connections are kept for the lifetime of the window: a
+        read/write handle in WAL mode (writes serialized by ``_db_lock``) and a
+        read-only handle for lookups, so the print/ack hot path never reopens
+        the database file.
         """
 
         data_dir = Path(user_data_dir("ColemanAgent", "Coleman"))
         data_dir.mkdir(parents=True, exist_ok=True)
         self._db_path = data_dir / "prints.sqlite"
 
-        with sqlite3.connect(self._db_path) as con:
-            con.execute(
-                """CREATE TABLE IF NOT EXISTS prints (
-                       id       INTEGER PRIMARY KEY AUTOINCREMENT,
-                       job_id   INTEGER,
-                       invoice  TEXT,
-                       pcs      INTEGER,
-                       zpl      TEXT,
-                       tstamp   TEXT,
-                       acked    INTEGER DEFAULT 0
-                   )"""
-            )
-            try:
-                con.execute("ALTER TABLE prints ADD COLUMN acked INTEGER DEFAULT 0")
-            except sqlite3.OperationalError:
-                pass
+        self._db_lock = Lock()
+        self._db_rw = sqlite3.connect(
+            self._db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+        )
+        with self._db_lock:
+            self._db_rw.executescript(_DB_PRAGMAS + _DB_SCHEMA)
+            (version,) = self._db_rw.execute("PRAGMA user_version").fetchone()
+        if version < DB_VERSION:
+            self._migrate_db(version)
+
+        self._db_ro = sqlite3.connect(
+            f"{self._db_path.as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        self._db_ro.executescript(_DB_PRAGMAS)
+
+    def _migrate_db(self, version: int) -> None:
+        """Upgrade a database created by an older release to ``DB_VERSION``."""
+        with self._db_write() as con:
+            if version < 1:
+                # v1: acked column (tables created before ack tracking)
+                cols = {row[1] for row in con.execute("PRAGMA table_info(prints)")}
+                if "acked" not in cols:
+                    con.execute(
+                        "ALTER TABLE prints ADD COLUMN acked INTEGER DEFAULT 0"
+                    )
+            if version < 2:
+                # v2: zpl_codec; existing rows stay uncompressed (ZPL_RAW)
+                cols = {row[1] for row in con.execute("PRAGMA table_info(prints)")}
+                if "zpl_codec" not in cols:
+                    con.execute(
+                        "ALTER TABLE prints ADD COLUMN zpl_codec INTEGER DEFAULT 0"
+                    )
+            con.execute(f"PRAGMA user_version={DB_VERSION}")
 
-            # pre-load IDs so we don’t re-print across restarts
-            self._seen_jobs.update(
-                row[0]
-                for row in con.execute(
-                    "SELECT DISTINCT job_id FROM prints WHERE job_id IS NOT NULL"
-                )
-            )
+    @contextmanager
+    def _db_write(self) -> Iterator[sqlite3.Connection]:
+        """Yield the shared read/write connection inside a write transaction."""
+        with self._db_lock:
+            self._db_rw.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db_rw
+            except BaseException:
+                self._db_rw.execute("ROLLBACK")
+                raise
+            self._db_rw.execute("COMMIT")
 
     def _is_job_acked(self, job_id: int) -> bool:
         """Return True if the given job has been acknowledged.
@@ -399,43 +848,72 @@ class MainWindow(QMainWindow):
         Returns:
             Whether the job has already been acknowledged.
         """
-        with sqlite3.connect(self._db_path) as con:
-            row = con.execute(
-                "SELECT acked FROM prints WHERE job_id=? ORDER BY id DESC LIMIT 1",
-                (job_id,),
-            ).fetchone()
+        row = self._db_ro.execute(
+            "SELECT acked FROM prints WHERE job_id=? ORDER BY id DESC LIMIT 1",
+            (job_id,),
+        ).fetchone()
         return bool(row and row[0])
 
     def _flush_pending_acks(self) -> None:
-        """Retry any previously unacknowledged print jobs."""
-        with sqlite3.connect(self._db_path) as con:
-            jobs = [
-                r[0]
-                for r in con.execute(
-                    "SELECT job_id FROM prints WHERE job_id IS NOT NULL AND acked=0"
+        """Retry all previously unacknowledged print jobs in one batch.
+
+        Jobs are marked acked only once the server confirms the batch. A
+        server without the batch event never answers, and the jobs stay
+        pending; when it re-sends one, ``_reserve_job`` acks it on its own.
+        """
+        jobs = [
+            r[0]
+            for r in self._db_ro.execute(
+                "SELECT DISTINCT job_id FROM prints "
+                "WHERE job_id IS NOT NULL AND acked=0"
+            ).fetchall()
+        ]
+        if not jobs:
+            return
+        if not self.sio.connected:
+            self.log_sig.emit(f"Ack pending for {len(jobs)} job(s)")
+            return
+        try:
+            self.sio.emit(
+                "print_label_ack_batch",
+                {"api_key": self.api_key, "job_ids": jobs, "status": "printed"},
+                callback=lambda *_: self._mark_acked(jobs),
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception("Batch ack failed for %d job(s)", len(jobs))
+            self.log_sig.emit(f"Ack error for {len(jobs)} pending job(s): {exc}")
+
+    def _mark_acked(self, job_ids: list[int]) -> None:
+        """Flag ``job_ids`` as acknowledged in a single write transaction."""
+        with self._db_write() as con:
+            for i in range(0, len(job_ids), ACK_BATCH_SIZE):
+                chunk = job_ids[i : i + ACK_BATCH_SIZE]
+                marks = ",".join("?" * len(chunk))
+                con.execute(
+                    f"UPDATE prints SET acked=1 WHERE job_id IN ({marks})", chunk
                 )
-            ]
-        for jid in jobs:
-            self.ack_sig.emit(jid)
+        with self._job_lock:
+            for jid in job_ids:
+                if jid in self._recent_jobs:
+                    self._recent_jobs[jid] = True
 
     # ------------------------------------------------------------------
     def _open_test_print(self) -> None:
         """Menu handler: open the raw-ZPL test-print dialog."""
-        TestPrintDialog(self, self.printer_name).exec()
+        TestPrintDialog(self, self.printer_name, self._submit).exec()
 
     @Slot()
     def _on_gui_connected(self):
         self.re_btn.setEnabled(False)
-        self.status_sig.emit("Connected")
-        if self._reconnect_timer.isActive():
-            self._reconnect_timer.stop()
+        self._set_status("Connected")
+        self._reconnect_timer.stop()
+        self._attempt = 0
 
     @Slot()
     def _on_gui_disconnected(self):
         self.re_btn.setEnabled(True)
-        self.status_sig.emit("Disconnected")
-        if not self._reconnect_timer.isActive():
-            self._reconnect_timer.start()
+        self._set_status("Disconnected")
+        self._schedule_reconnect()
 
     # ─── still inside MainWindow class (anywhere convenient) ─────────────────────
     def _manual_reconnect(self) -> None:
@@ -465,7 +943,21 @@ class MainWindow(QMainWindow):
     def _reconnect_tick(self) -> None:
         if not self.sio.connected and not self._connecting and self.api_key and self.server_url:
             self.log_sig.emit("Reconnecting…")
-            self._connect_socket()
+            self._connect_socket()  # a failure re-arms the timer via gui_disconnected
+
+    def _schedule_reconnect(self) -> None:
+        """Arm the one-shot retry timer with the next backoff delay.
+
+        The delay doubles per failed attempt up to ``_retry_max_ms`` and is
+        spread by ``±_retry_jitter`` so agents don't all retry in lockstep
+        after a server restart. A retry that is already pending is left alone.
+        """
+        if self._reconnect_timer.isActive():
+            return
+        base = min(self._retry_max_ms, self._retry_min_ms << min(self._attempt, 16))
+        jitter = _RNG.uniform(-self._retry_jitter, self._retry_jitter)
+        self._attempt += 1
+        self._reconnect_timer.start(max(0, int(base * (1 + jitter))))
 
     def closeEvent(self, event: QCloseEvent) -> None:  # type: ignore[override]
         """Disconnect the socket client before the window closes.
@@ -473,8 +965,15 @@ class MainWindow(QMainWindow):
         Args:
             event: The Qt close event being processed.
         """
+        self._closing = True
+        self._history_timer.stop()
+        self._stop_print_worker()
+        # an in-progress connect finishes here, so disconnect only afterwards
+        self._bg_pool.waitForDone()
         if self.sio.connected:
             self.sio.disconnect()
+        self._db_ro.close()
+        self._db_rw.close()
         super().closeEvent(event)
 
     # ===================================================================== MENU
@@ -494,13 +993,22 @@ class MainWindow(QMainWindow):
 
     # ================================================================== PREFS
     def _load_prefs(self) -> None:
-        """Load persisted preferences."""
-        self.api_key = S.value("api_key", "").strip()
-        self.printer_name = S.value("printer_name", DEFAULT_PRINTER)
-        self.server_url = S.value("server_url", SERVER_URL).strip()
+        """Load persisted preferences into cached attributes.
+
+        Steady-state code reads these attributes and never touches ``S``.
+        """
+        prefs = _read_prefs()
+        self.api_key = prefs["api_key"]
+        self.printer_name = prefs["printer_name"]
+        self.server_url = prefs["server_url"]
+        _PRINTER.chunk_size = max(1, prefs["write_chunk_bytes"])
+        # reconnect tuning; not exposed in the dialog, set via QSettings
+        self._retry_min_ms = max(1, prefs["reconnect_min_ms"])
+        self._retry_max_ms = max(self._retry_min_ms, prefs["reconnect_max_ms"])
+        self._retry_jitter = min(1.0, prefs["reconnect_jitter"])
 
         if not self.api_key:
-            self.status_sig.emit("No API key")
+            self._set_status("No API key")
 
     # ============================================================ SOCKET HANDL.
     def _register_handlers(self) -> None:
@@ -508,7 +1016,6 @@ class MainWindow(QMainWindow):
 
         @self.sio.event
         def connect():
-            print("SocketIO: connected")
             self.log_sig.emit("Connected")
             self.gui_connected.emit()
             self._flush_pending_acks()
@@ -518,119 +1025,273 @@ class MainWindow(QMainWindow):
 
         @self.sio.event
         def disconnect():
-            print("SocketIO: disconnect event fired")
             self.log_sig.emit("Disconnected")
             self.gui_disconnected.emit()
-            if not self._reconnect_timer.isActive():
-                self._reconnect_timer.start()
 
         @self.sio.event
         def connect_error(err):
-            print(f"SocketIO: connect_error fired: {err}")
             self.log_sig.emit(f"Connect failed: {err}")
             if not self.sio.connected:
-                self.status_sig.emit("Disconnected")
-                self.re_btn.setEnabled(True)
-                if not self._reconnect_timer.isActive():
-                    self._reconnect_timer.start()
+                # status, button and retry timer are updated on the GUI thread
+                self.gui_disconnected.emit()
 
         @self.sio.on("status")
         def on_status(data):
-            print(f"SocketIO: status event fired with data: {data}")
             self.log_sig.emit(f"Server status: {data.get('msg')}")
 
         @self.sio.on("print_label")
-        def on_print_label(data):
-            print(f"SocketIO: print_label event fired with data: {data}")
-            Thread(target=self._handle_print_job, args=(data,), daemon=True).start()
+        def on_print_label(data, zpl=None):
+            if isinstance(zpl, (bytes, bytearray)):
+                logger.debug("print_label received (%d byte attachment)", len(zpl))
+            else:
+                logger.debug("print_label received (%s)", type(zpl).__name__)
+            # servers may send the ZPL as a separate binary attachment after a
+            # small JSON header; it arrives as bytes and is never decoded
+            if zpl is not None and isinstance(data, dict):
+                data = {**data, "data": zpl}
+            # validate on the reader so bad payloads never reach the worker
+            try:
+                job = PrintJob.from_payload(data)
+            except (TypeError, ValueError) as exc:
+                self.log_sig.emit(f"Malformed print job ignored: {exc}")
+                return
+            if not job.data:
+                self.log_sig.emit(f"Job {job.job_id or job.invoice} ignored (no ZPL)")
+                return
+            if not self._submit(self._handle_print_job, job):
+                # left unacked, so the server still lists it as outstanding
+                self.log_sig.emit(
+                    f"Job {job.job_id or job.invoice} dropped (queue full)"
+                )
 
     # .........................................................................
     def _connect_socket(self) -> None:
-        """Connect/reconnect to socket.io with logging."""
+        """Start a socket.io (re)connect without blocking the GUI."""
+        if self._closing:
+            return
         if not self.api_key or not self.server_url:
-            self.status_sig.emit("Missing API key or URL")
+            self._set_status("Missing API key or URL")
             return
+        if self._connecting:
+            return
+        self._connecting = True
+        # the handshake can take up to CONNECT_TIMEOUT_S; run it on the pool
+        self._bg_pool.start(partial(self._do_connect, self.server_url, self.api_key))
 
-        if self.sio.connected:
-            self.sio.disconnect()
-
+    def _do_connect(self, server_url: str, api_key: str) -> None:
+        """Connect on a pool thread; failures are retried from the GUI thread."""
         try:
-            if self._connecting:
-                return
-            self._connecting = True
+            if self.sio.connected:
+                self.sio.disconnect()
             self.sio.connect(
-                self.server_url,
-                transports=["websocket", "polling"],
-                auth={"api_key": self.api_key},
+                server_url,
+                transports=["websocket"],  # no long-polling handshake/upgrade
+                auth={"api_key": api_key},
+                wait_timeout=CONNECT_TIMEOUT_S,
             )
-            print("Attempting socket.io connection...")
-        except Exception as exc:
+        except Exception as exc:  # pylint: disable=broad-except
             self.log_sig.emit(f"Connection error: {exc}")
-            self.status_sig.emit("Disconnected")
+            # status, button and retry timer are updated on the GUI thread
+            self.gui_disconnected.emit()
+        finally:
             self._connecting = False
 
     # .........................................................................
-    def _handle_print_job(self, data: dict) -> None:
-        job_id = data.get("job_id")
-        inv = data.get("invoice")
-        pcs = data.get("pcs")
-        zpl = data.get("data")
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> bool:
+        """Queue ``fn(*args)`` for the print worker without blocking.
 
-        # Dedupe / reserve before doing any work
-        with self._job_lock:
-            if job_id:
-                if job_id in self._inflight:
-                    self.log_sig.emit(f"Job {job_id} ignored (already in-flight)")
-                    return
-                if job_id in self._seen_jobs:
-                    if not self._is_job_acked(job_id):
-                        self.log_sig.emit(
-                            f"Job {job_id} ignored (already printed, ack pending)"
-                        )
-                        self.ack_sig.emit(job_id)
-                    else:
-                        self.log_sig.emit(f"Job {job_id} ignored (already printed)")
-                    return
-                self._inflight.add(job_id)
-            else:
-                # fingerprint-based suppression for jobs without ID
-                fp = _make_fingerprint(inv, pcs, zpl)
-                now = dt.datetime.now().timestamp()
-                # cleanup stale fingerprints
-                for key, ts in list(self._recent_fingerprints.items()):
-                    if now - ts > self._fingerprint_ttl:
-                        del self._recent_fingerprints[key]
-                last = self._recent_fingerprints.get(fp)
-                if last and now - last < self._fingerprint_ttl:
-                    self.log_sig.emit(
-                        f"Ignoring duplicate unlabeled job for invoice {inv}"
-                    )
+        Returns:
+            ``False`` if the queue is full and the work was dropped.
+        """
+        try:
+            self._print_q.put_nowait((fn, args))
+        except queue.Full:
+            return False
+        return True
+
+    def _print_worker(self) -> None:
+        """Run queued print work in order until the ``None`` sentinel.
+
+        Print jobs queued back to back are handed to ``_print_jobs`` together
+        (up to ``PRINT_BATCH_MAX``). Every item is marked done, so
+        ``_print_q.join()`` waits for the queue to drain.
+        """
+        empty = object()
+        held: Any = empty  # item read while batching, run on the next pass
+        while True:
+            item = self._print_q.get() if held is empty else held
+            held = empty
+            taken = 1
+            try:
+                if item is None:
+                    _PRINTER.close()  # shutting down; release the spooler handle
                     return
-                self._recent_fingerprints[fp] = now
+                fn, args = item
+                if fn != self._handle_print_job:
+                    fn(*args)
+                    continue
+                jobs = [args[0]]
+                while len(jobs) < PRINT_BATCH_MAX:
+                    try:
+                        nxt = self._print_q.get(PRINT_BATCH_S > 0, PRINT_BATCH_S)
+                    except queue.Empty:
+                        break
+                    if nxt is None or nxt[0] != self._handle_print_job:
+                        held = nxt
+                        break
+                    jobs.append(nxt[1][0])
+                    taken += 1
+                self._print_jobs(jobs)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.exception("Print worker error")
+                self.log_sig.emit(f"Print worker error: {exc}")
+            finally:
+                for _ in range(taken):
+                    self._print_q.task_done()
+
+    def _stop_print_worker(self) -> None:
+        """Discard pending work and wait for the worker to finish its current item.
+
+        The label being printed still needs the DB to be stored and acked, so
+        this must run before the connections are closed.
+        """
+        while True:
+            try:
+                self._print_q.get_nowait()
+            except queue.Empty:
+                break
+            self._print_q.task_done()
+        self._print_q.put(None)
+        self._print_thread.join(PRINT_STOP_TIMEOUT_S)
+
+    def _handle_print_job(self, job: PrintJob) -> None:
+        """Print a single job; see ``_print_jobs``."""
+        self._print_jobs([job])
+
+    def _print_jobs(self, jobs: list[PrintJob]) -> None:
+        """Print ``jobs`` as one spooler document and record each success.
+
+        ZPL labels concatenate (``^XA…^XZ^XA…^XZ``), so a burst costs one
+        StartDoc/EndDoc round-trip instead of one per label. The document
+        succeeds or fails as a whole; on failure no job is stored or acked.
+        """
+        reserved: list[tuple[PrintJob, bytes | None]] = []
+        try:
+            for job in jobs:
+                reserved.append((job, self._reserve_job(job)))
+        except Exception:
+            # don't leave earlier jobs of this batch marked in-flight for good
+            self._inflight.difference_update(
+                job.job_id for job, zpl in reserved if zpl is not None and job.job_id
+            )
+            raise
+        batch = [(job, zpl) for job, zpl in reserved if zpl is not None]
+        if not batch:
+            return
+        job_ids = [job.job_id for job, _ in batch if job.job_id]
 
         def cb(ok: bool, msg: str) -> None:
+            if len(batch) > 1:
+                msg = f"{msg} ({len(batch)} labels)"
             self.log_sig.emit(msg)
-            if ok:
-                with self._job_lock:
-                    if job_id:
-                        self._inflight.discard(job_id)
-                        self._seen_jobs.add(job_id)
-                # persist to DB + update GUI list
-                self._store_print(job_id, inv, pcs, zpl)
-                if job_id:
-                    self.ack_sig.emit(job_id)
+            # release the reservation; on failure the job can be retried
+            self._inflight.difference_update(job_ids)
+            if not ok:
+                return
+            with self._job_lock:
+                for job_id in job_ids:
+                    self._remember_job(job_id, False)
+            # persist to DB + update GUI list
+            self._store_prints(
+                [(job.job_id, job.invoice, job.pcs, zpl) for job, zpl in batch]
+            )
+            for job_id in job_ids:
+                # sio.emit is thread-safe; no need to hop via the GUI loop
+                self._emit_ack(job_id)
+
+        _print_zpl(self.printer_name, b"".join(zpl for _, zpl in batch), cb)
+
+    def _reserve_job(self, job: PrintJob) -> bytes | None:
+        """Dedupe ``job`` and mark it in-flight.
+
+        Returns:
+            The encoded ZPL to print, or ``None`` if the job is skipped.
+        """
+        job_id, inv, pcs = job.job_id, job.invoice, job.pcs
+        zpl = _zpl_bytes(job.data)  # stays bytes through print + DB
+        if len(zpl) > MAX_ZPL_BYTES:
+            # never acked, so the server keeps it as outstanding
+            self.log_sig.emit(
+                f"Job {job_id or inv} rejected ({len(zpl)} bytes exceeds limit)"
+            )
+            return None
+        # only job_id-less jobs need a fingerprint
+        fp = None if job_id else _make_fingerprint(inv, pcs, zpl)
+
+        acked = self._job_acked_state(job_id) if job_id else None
+
+        if acked is not None:
+            if acked:
+                self.log_sig.emit(f"Job {job_id} ignored (already printed)")
             else:
-                # on failure, release reservation so it can be retried
-                with self._job_lock:
-                    if job_id:
-                        self._inflight.discard(job_id)
+                self.log_sig.emit(
+                    f"Job {job_id} ignored (already printed, ack pending)"
+                )
+                self._emit_ack(job_id)
+            return None
+
+        # Dedupe / reserve before doing any work; worker-only state, no lock
+        if job_id:
+            if job_id in self._inflight:
+                self.log_sig.emit(f"Job {job_id} ignored (already in-flight)")
+                return None
+            self._inflight.add(job_id)
+            return zpl
+
+        # fingerprint-based suppression for jobs without ID
+        now = time.monotonic()
+        expire_stale_jobs(self._recent_fingerprints, self._fingerprint_ttl, now)
+        last = self._recent_fingerprints.get(fp)
+        if last and now - last < self._fingerprint_ttl:
+            self.log_sig.emit(f"Ignoring duplicate unlabeled job for invoice {inv}")
+            return None
+        self._recent_fingerprints[fp] = now
+        self._recent_fingerprints.move_to_end(fp)
+        if len(self._recent_fingerprints) > self._fingerprint_cap:
+            self._recent_fingerprints.popitem(last=False)
+        return zpl
+
+    def _job_acked_state(self, job_id: int) -> bool | None:
+        """Return whether ``job_id`` was acked, or ``None`` if never printed."""
+        with self._job_lock:
+            acked = self._recent_jobs.get(job_id)
+            if acked is not None:
+                self._recent_jobs.move_to_end(job_id)
+                return acked
+        row = self._db_ro.execute(
+            "SELECT acked FROM prints WHERE job_id=? ORDER BY id DESC LIMIT 1",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        acked = bool(row[0])
+        with self._job_lock:
+            self._remember_job(job_id, acked)
+        return acked
 
-        _print_zpl(self.printer_name, zpl, cb)
+    def _remember_job(self, job_id: int, acked: bool) -> None:
+        """Cache a printed job's ack state; caller must hold ``_job_lock``."""
+        self._recent_jobs[job_id] = acked
+        self._recent_jobs.move_to_end(job_id)
+        if len(self._recent_jobs) > self._recent_jobs_cap:
+            self._recent_jobs.popitem(last=False)
 
     # .........................................................................
     def _emit_ack(self, job_id: int) -> None:
         """Acknowledge a completed print job back to the server.
 
+        Runs on the print worker right after the job is stored.
+
         Args:
             job_id: The identifier of the job to acknowledge.
         """
@@ -638,27 +1299,40 @@ class MainWindow(QMainWindow):
             return
         if self.sio.connected:
             try:
-                self.sio.emit("print_label_ack", {"job_id": job_id})
-                with sqlite3.connect(self._db_path) as con:
-                    con.execute("UPDATE prints SET acked=1 WHERE job_id=?", (job_id,))
+                self.sio.emit(
+                    "print_label_ack", {"job_id": job_id, "status": "printed"}
+                )
+                self._mark_acked([job_id])
             except Exception as exc:  # pylint: disable=broad-except
+                logger.exception("Ack failed for job %s", job_id)
                 self.log_sig.emit(f"Ack error for job {job_id}: {exc}")
         else:
             self.log_sig.emit(f"Ack pending for job {job_id}")
 
     def _store_print(self, job_id, invoice, pcs, zpl) -> None:
         """Persist a successfully printed job to the local database."""
+        self._store_prints([(job_id, invoice, pcs, zpl)])
+
+    def _store_prints(self, rows: list[tuple]) -> None:
+        """Persist printed ``(job_id, invoice, pcs, zpl)`` rows in one commit."""
         tstamp = dt.datetime.now().isoformat(timespec="seconds")
-        with sqlite3.connect(self._db_path) as con:
-            con.execute(
+        # compress before taking the write lock; the transaction only inserts
+        packed = [
+            (job_id, invoice, pcs, *_pack_zpl(_zpl_bytes(zpl)), tstamp)
+            for job_id, invoice, pcs, zpl in rows
+        ]
+        with self._db_write() as con:
+            con.executemany(
                 (
-                    "INSERT INTO prints (job_id, invoice, pcs, zpl, tstamp, acked) "
-                    "VALUES (?,?,?,?,?,0)"
+                    "INSERT INTO prints "
+                    "(job_id, invoice, pcs, zpl, zpl_codec, tstamp, acked) "
+                    "VALUES (?,?,?,?,?,?,0)"
                 ),
-                (job_id, invoice, pcs, zpl, tstamp),
+                packed,
             )
         # safely update GUI from any thread:
-        self.add_print_sig.emit(invoice, pcs or 1, tstamp)
+        for _, invoice, pcs, _ in rows:
+            self.add_print_sig.emit(invoice, pcs or 1, tstamp)
 
     # ================================================================ GUI UTILS
     def _open_options(self) -> None:
@@ -666,12 +1340,51 @@ class MainWindow(QMainWindow):
         dlg = OptionsDialog(self)
         if dlg.exec():
             self._load_prefs()
+            # reconnect now with the new settings, restarting the backoff
+            self._reconnect_timer.stop()
+            self._attempt = 0
             self._reconnect.emit()
 
     def _log(self, text: str) -> None:
-        """Append a timestamped line to the output widget."""
-        ts = dt.datetime.now().strftime("%H:%M:%S")
-        self.out.append(f"[{ts}] {text}")
+        """Buffer a line for the output widget (any thread)."""
+        with self._log_lock:
+            self._log_buf.append(text)
+            wake = len(self._log_buf) == 1
+        if wake:
+            self._log_wake.emit()
+
+    def _flush_log(self) -> None:
+        """Append all buffered log lines to the output widget in one go.
+
+        Lines are stamped when flushed, so the clock is formatted at most
+        once per second however many lines arrive; the flush follows the
+        first buffered line by at most the timer interval.
+        """
+        with self._log_lock:
+            lines = list(self._log_buf)
+            self._log_buf.clear()
+        if lines:
+            prefix = self._ts()
+            # plain-text insert at the end: one layout pass for the batch and
+            # no rich-text parsing, unlike QTextEdit.append()
+            text = "\n".join(prefix + line for line in lines)
+            if not self.out.document().isEmpty():
+                text = "\n" + text
+            self.out.moveCursor(QTextCursor.End)
+            self.out.insertPlainText(text)
+
+    def _ts(self) -> str:
+        """Return the ``[HH:MM:SS] `` log prefix, formatted once per second."""
+        sec = int(time.time())
+        if sec != self._ts_cache[0]:
+            self._ts_cache = (sec, time.strftime("[%H:%M:%S] ", time.localtime(sec)))
+        return self._ts_cache[1]
+
+    def _set_status(self, text: str) -> None:
+        """Show ``text`` in the status bar, skipping repeats of the last value."""
+        if text != self._status_text:
+            self._status_text = text
+            self.status_sig.emit(text)
 
 
 # -----------------------------------------------------------------------------
@@ -679,6 +1392,44 @@ class MainWindow(QMainWindow):
 # -----------------------------------------------------------------------------
 
 
+class _RingHandler(logging.handlers.MemoryHandler):
+    """Keep the last ``capacity`` records and write them out only on an error.
+
+    Unlike :class:`~logging.handlers.MemoryHandler`, a full buffer drops its
+    oldest record instead of flushing, so routine output never reaches disk.
+    """
+
+    def __init__(self, capacity: int, flushLevel: int, target: logging.Handler):
+        super().__init__(capacity, flushLevel, target, flushOnClose=False)
+        self.buffer = deque(maxlen=capacity)
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= self.flushLevel
+
+
+def _setup_logging(log_dir: Path) -> None:
+    """Ring-buffer log records; dump them to ``agent.log`` when an error occurs."""
+    log_dir.mkdir(parents=True, exist_ok=True)
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_dir / "agent.log",
+        maxBytes=1_000_000,
+        backupCount=2,
+        encoding="utf-8",
+        delay=True,  # no file until the first error
+    )
+    file_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s")
+    )
+    logging.getLogger().addHandler(_RingHandler(512, logging.ERROR, file_handler))
+
+    # the agent's own DEBUG records always reach the ring buffer, which is
+    # what gets written out around an error
+    logger.setLevel(logging.DEBUG)
+    for name in ("socketio.client", "engineio.client"):
+        # per-packet DEBUG records are only created while debugging
+        logging.getLogger(name).setLevel(logging.DEBUG if DEBUG else logging.WARNING)
+
+
 def main():
     """Run the print agent GUI application."""
     if not ensure_single_instance("Coleman Print Agent"):
@@ -689,6 +1440,8 @@ def main():
         sys.exit(0)
         return
 
+    _setup_logging(Path(user_data_dir("ColemanAgent", "Coleman")))
+
     app = QApplication(sys.argv)
 
     icon_file = resource_path("assets/icon.ico")
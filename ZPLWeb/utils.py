@@ -1,22 +1,67 @@
-import atexit
 import hashlib
 import os
 import sys
 import tempfile
+from collections import OrderedDict
+from collections.abc import Hashable
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
 
-def _make_fingerprint(invoice, pcs, zpl) -> str:
-    h = hashlib.sha256()
-    h.update((invoice or "").encode("utf-8"))
-    h.update(str(pcs or "").encode("utf-8"))
-    h.update((zpl or "").encode("utf-8"))
-    return h.hexdigest()
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - optional speed-up
+    xxhash = None
 
 
+def _make_fingerprint(invoice, pcs, zpl) -> int:
+    """Return a 128-bit digest identifying a job by its invoice, copies and ZPL.
+
+    The value only de-duplicates jobs within this process, so a fast
+    non-cryptographic hash (xxh3) is used, falling back to blake2b when
+    ``xxhash`` is not installed. It is returned as an int, which is smaller
+    and cheaper to hash as a dict key than the hex string.
+    Fields are NUL-separated so shifting characters between them changes
+    the result. They are joined into one buffer and hashed in a single call.
+    """
+    body = zpl if isinstance(zpl, bytes) else (zpl or "").encode("utf-8")
+    buf = f"{invoice or ''}\x00{pcs or ''}\x00".encode("utf-8") + body
+    if xxhash:
+        return xxhash.xxh3_128_intdigest(buf)
+    return int.from_bytes(hashlib.blake2b(buf, digest_size=16).digest(), "big")
+
+
+def expire_stale_jobs(
+    store: OrderedDict[Hashable, float], ttl: float, now: float
+) -> None:
+    """Drop entries at least ``ttl`` seconds old from ``store`` in place.
+
+    ``store`` must be kept in timestamp order (insert with ``move_to_end``),
+    so only the stale prefix is visited rather than the whole mapping.
+
+    Args:
+        store: Mapping of key to the monotonic time it was last seen.
+        ttl: Age in seconds at which an entry is discarded.
+        now: Current monotonic time.
+    """
+    while store:
+        key, ts = next(iter(store.items()))
+        if now - ts < ttl:
+            break
+        del store[key]
+
+
+@lru_cache(maxsize=None)
 def resource_path(relative_path: str) -> str:
     """Return absolute path to a bundled resource.
 
+    Results are cached; the bundle location is fixed for the process.
+
     Args:
         relative_path: Path relative to the project root or frozen bundle.
 
@@ -56,13 +101,21 @@ def _lock_file_path() -> Path:
 
 _LOCK_FILE = _lock_file_path()
 _SINGLETON_MUTEX = None
+_LOCK_FD: int | None = None
 
 
-def _pid_alive(pid: int) -> bool:
-    """Return ``True`` if ``pid`` is currently running."""
+def _try_lock(fd: int) -> bool:
+    """Take a non-blocking exclusive lock on ``fd``.
 
+    Returns:
+        ``True`` if the lock was acquired, ``False`` if another process
+        holds it.
+    """
     try:
-        os.kill(pid, 0)
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:  # pragma: no cover - Windows without pywin32
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
     except OSError:
         return False
     return True
@@ -106,31 +159,11 @@ def ensure_single_instance(window_title: str) -> bool:
         except Exception:  # pragma: no cover - pywin32 absent or failing
             pass
 
-    pid = os.getpid()
-    while True:
-        try:
-            fd = os.open(_LOCK_FILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
-            os.write(fd, str(pid).encode())
-            os.close(fd)
-            break
-        except FileExistsError:
-            try:
-                existing_pid = int(_LOCK_FILE.read_text())
-            except Exception:
-                existing_pid = None
-            if existing_pid and _pid_alive(existing_pid):
-                return False
-            try:
-                _LOCK_FILE.unlink()
-            except FileNotFoundError:  # race: file removed after exist check
-                continue
-
-    def _cleanup() -> None:
-        try:
-            if _LOCK_FILE.exists() and _LOCK_FILE.read_text() == str(pid):
-                _LOCK_FILE.unlink()
-        except Exception:
-            pass
-
-    atexit.register(_cleanup)
+    global _LOCK_FD
+    fd = os.open(_LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+    if not _try_lock(fd):
+        os.close(fd)
+        return False
+    # kept open for the process lifetime; the OS drops the lock on exit/crash
+    _LOCK_FD = fd
     return True
@@ -32,3 +32,36 @@ def test_emit_ack_updates_db(app, tmp_path, monkeypatch):
     assert win._is_job_acked(job_id)
     assert win.sio.last == ("print_label_ack", {"job_id": job_id, "status": "printed"})
     win.close()
+
+
+def test_flush_pending_acks_batches(app, tmp_path, monkeypatch):
+    """Unacknowledged jobs are acked with a single batched emit."""
+    monkeypatch.setattr("ZPLWeb.main.user_data_dir", lambda *a, **k: tmp_path)
+    win = MainWindow()
+    for job_id in (1, 2, 3):
+        win._store_print(job_id, "INV", 1, "^XA^XZ")
+    win._mark_acked([2])
+
+    class DummySio:
+        connected = True
+
+        def __init__(self) -> None:
+            self.sent = []
+
+        def emit(self, event, data, callback=None):
+            self.sent.append((event, data, callback))
+
+        def disconnect(self) -> None:  # pragma: no cover - called on close
+            self.connected = False
+
+    win.sio = DummySio()
+    win._flush_pending_acks()
+    assert len(win.sio.sent) == 1
+    event, data, confirm = win.sio.sent[0]
+    assert event == "print_label_ack_batch"
+    assert sorted(data["job_ids"]) == [1, 3]
+    assert not win._is_job_acked(1)  # unconfirmed batches stay pending
+
+    confirm()  # the server's socket.io ack
+    assert all(win._is_job_acked(j) for j in (1, 2, 3))
+    win.close()
@@ -0,0 +1,192 @@
+import sqlite3
+import time
+from threading import Event
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+import ZPLWeb.main as main_module
+from ZPLWeb.main import MainWindow, PrintJob
+
+
+@pytest.fixture(scope="module")
+def app():
+    """Provide a QApplication instance for widget tests."""
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def win(app, tmp_path, monkeypatch):
+    """Main window backed by a throw-away database."""
+    monkeypatch.setattr("ZPLWeb.main.user_data_dir", lambda *a, **k: tmp_path)
+    window = MainWindow()
+    yield window
+    window.close()
+
+
+def _printed_rows(win, job_id):
+    return win._db_ro.execute(
+        "SELECT COUNT(*) FROM prints WHERE job_id=?", (job_id,)
+    ).fetchone()[0]
+
+
+def test_labeled_job_printed_once(win):
+    job = PrintJob(job_id=5, invoice="INV", pcs=1, data="^XA^XZ")
+    win._handle_print_job(job)
+    win._handle_print_job(job)
+    assert _printed_rows(win, 5) == 1
+
+
+def test_job_from_previous_run_not_reprinted(win):
+    """Jobs already in the DB are recognized without an in-memory preload."""
+    win._store_print(9, "INV", 1, "^XA^XZ")
+    win._mark_acked([9])
+    assert win._job_acked_state(9) is True
+    win._handle_print_job(PrintJob(job_id=9, invoice="INV", data="^XA^XZ"))
+    assert _printed_rows(win, 9) == 1
+
+
+def test_unlabeled_duplicate_suppressed(win):
+    job = PrintJob(invoice="INV", pcs=1, data="^XA^XZ")
+    win._handle_print_job(job)
+    win._handle_print_job(job)
+    rows = win._db_ro.execute(
+        "SELECT COUNT(*) FROM prints WHERE job_id IS NULL"
+    ).fetchone()[0]
+    assert rows == 1
+
+
+def test_oversized_job_rejected(win, monkeypatch):
+    monkeypatch.setattr("ZPLWeb.main.MAX_ZPL_BYTES", 4)
+    win._handle_print_job(PrintJob(job_id=11, invoice="INV", data="^XA^XZ"))
+    assert _printed_rows(win, 11) == 0
+    assert 11 not in win._inflight
+
+
+def test_print_job_from_payload():
+    payload = {"job_id": "7", "invoice": 12, "pcs": "2", "data": "^XA"}
+    job = PrintJob.from_payload(payload)
+    assert job == PrintJob(job_id=7, invoice="12", pcs=2, data="^XA")
+    assert PrintJob.from_payload({"invoice": "INV"}).data == b""
+    with pytest.raises(ValueError):
+        PrintJob.from_payload({"job_id": "abc"})
+    with pytest.raises(TypeError):
+        PrintJob.from_payload({"data": ["^XA"]})
+
+
+@pytest.mark.parametrize("pcs", ["", "two", None, 0])
+def test_print_job_without_usable_copies_still_prints(pcs):
+    assert PrintJob.from_payload({"invoice": "INV", "pcs": pcs}).pcs is None
+
+
+def test_print_job_rejects_fractional_job_id():
+    assert PrintJob.from_payload({"job_id": 7.0}).job_id == 7
+    with pytest.raises(ValueError):
+        PrintJob.from_payload({"job_id": 7.9})
+
+
+def test_print_job_accepts_bytearray_zpl():
+    assert PrintJob.from_payload({"data": bytearray(b"^XA")}).data == b"^XA"
+
+
+def test_printed_job_acked_from_worker(win):
+    """Acks are sent straight from the print callback, not via the GUI loop."""
+    sent = []
+
+    class DummySio:
+        connected = True
+
+        def emit(self, event, data):
+            sent.append((event, data))
+
+        def disconnect(self) -> None:  # pragma: no cover - called on close
+            self.connected = False
+
+    win.sio = DummySio()
+    win._handle_print_job(PrintJob(job_id=21, invoice="INV", data="^XA^XZ"))
+    assert sent == [("print_label_ack", {"job_id": 21, "status": "printed"})]
+    assert win._is_job_acked(21)
+
+
+def test_submit_drops_when_queue_full(win, monkeypatch):
+    """A full print queue rejects new work instead of blocking the reader."""
+    win._stop_print_worker()
+    monkeypatch.setattr(win, "_print_q", main_module.queue.Queue(maxsize=1))
+    assert win._submit(print)
+    assert not win._submit(print)
+
+
+def test_worker_drains_queued_jobs(win):
+    """Jobs submitted to the worker are printed in order; join() waits."""
+    for job_id in (31, 32):
+        assert win._submit(win._handle_print_job, PrintJob(job_id=job_id, data="^XA"))
+    win._print_q.join()
+    assert _printed_rows(win, 31) == _printed_rows(win, 32) == 1
+
+
+def test_queued_jobs_share_one_spooler_document(win, monkeypatch):
+    """Back-to-back jobs are concatenated into a single print call."""
+    sent = []
+    monkeypatch.setattr(
+        "ZPLWeb.main._print_zpl",
+        lambda printer, zpl, cb: (sent.append(zpl), cb(True, "Printed")),
+    )
+    win._print_jobs(
+        [
+            PrintJob(job_id=41, data="^XA1^XZ"),
+            PrintJob(job_id=41, data="^XA1^XZ"),  # duplicate within the batch
+            PrintJob(job_id=42, data="^XA2^XZ"),
+        ]
+    )
+    assert sent == [b"^XA1^XZ^XA2^XZ"]
+    assert _printed_rows(win, 41) == _printed_rows(win, 42) == 1
+    assert not win._inflight
+
+
+def test_close_waits_for_label_being_printed(app, tmp_path, monkeypatch):
+    """A label printing at shutdown is still stored before the DB closes."""
+    monkeypatch.setattr("ZPLWeb.main.user_data_dir", lambda *a, **k: tmp_path)
+    started = Event()
+
+    def slow_print(printer, zpl, cb):
+        started.set()
+        time.sleep(0.2)
+        cb(True, "Printed")
+
+    monkeypatch.setattr("ZPLWeb.main._print_zpl", slow_print)
+    win = MainWindow()
+    win._submit(win._handle_print_job, PrintJob(job_id=51, invoice="INV", data="^XA"))
+    assert started.wait(5)
+    win.close()
+
+    assert not win._print_thread.is_alive()
+    with sqlite3.connect(tmp_path / "prints.sqlite") as con:
+        assert con.execute("SELECT job_id FROM prints").fetchall() == [(51,)]
+
+
+def test_failed_reservation_releases_batch(win, monkeypatch):
+    """An error part-way through reserving a batch frees the jobs before it."""
+    reserve = win._reserve_job
+
+    def flaky(job):
+        if job.job_id == 62:
+            raise sqlite3.OperationalError("disk I/O error")
+        return reserve(job)
+
+    monkeypatch.setattr(win, "_reserve_job", flaky)
+    with pytest.raises(sqlite3.OperationalError):
+        win._print_jobs([PrintJob(job_id=61, data="^XA"), PrintJob(job_id=62)])
+    assert not win._inflight
+
+
+def test_non_bytes_attachment_rejected_as_malformed(win):
+    """A non-binary second argument is validated, not measured."""
+    logged = []
+    win.log_sig.disconnect()
+    win.log_sig.connect(logged.append)
+    handler = win.sio.handlers["/"]["print_label"]
+
+    handler({"job_id": 71, "invoice": "INV"}, 5)
+    assert logged == [
+        "Malformed print job ignored: ZPL must be text or bytes, got int"
+    ]
@@ -0,0 +1,134 @@
+import sqlite3
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+import ZPLWeb.main as main_module
+from ZPLWeb.main import DB_VERSION, MainWindow, PrintHistoryModel
+
+
+@pytest.fixture(scope="module")
+def app():
+    """Provide a QApplication instance for widget tests."""
+    return QApplication.instance() or QApplication([])
+
+
+def test_load_history_newest_first(app, tmp_path, monkeypatch):
+    """_load_history should list the most recent print at the top."""
+    monkeypatch.setattr("ZPLWeb.main.user_data_dir", lambda *a, **k: tmp_path)
+    win = MainWindow()
+    win._store_print(1, "OLD", 1, "^XA^XZ")
+    win._store_print(2, "NEW", 3, "^XA^XZ")
+
+    win._load_history()
+    win._bg_pool.waitForDone()
+    app.processEvents()
+
+    rows = [win.history.index(i).data() for i in range(win.history.rowCount())]
+    assert rows == ["NEW  x3", "OLD  x1"]
+    win.close()
+
+
+def test_history_model_caps_rows(app):
+    """New prints go on top and the oldest row is dropped once full."""
+    model = PrintHistoryModel(maxlen=2)
+    model.reset(["B", "A"])
+    model.prepend("C")
+    assert [model.index(i).data() for i in range(model.rowCount())] == ["C", "B"]
+
+
+def test_init_db_migrates_old_schema(app, tmp_path, monkeypatch):
+    """Databases from before ack tracking gain the acked column once."""
+    with sqlite3.connect(tmp_path / "prints.sqlite") as con:
+        con.execute(
+            "CREATE TABLE prints (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "job_id INTEGER, invoice TEXT, pcs INTEGER, zpl TEXT, tstamp TEXT)"
+        )
+        con.execute("INSERT INTO prints (job_id, invoice) VALUES (7, 'OLD')")
+    monkeypatch.setattr("ZPLWeb.main.user_data_dir", lambda *a, **k: tmp_path)
+    win = MainWindow()
+
+    assert not win._is_job_acked(7)
+    assert win._db_ro.execute("PRAGMA user_version").fetchone()[0] == DB_VERSION
+    win.close()
+
+
+def test_read_connection_gets_tuning_pragmas(app, tmp_path, monkeypatch):
+    """Both DB handles share the per-connection cache settings."""
+    monkeypatch.setattr("ZPLWeb.main.user_data_dir", lambda *a, **k: tmp_path)
+    win = MainWindow()
+    for con in (win._db_rw, win._db_ro):
+        assert con.execute("PRAGMA cache_size").fetchone()[0] == -65536
+        assert con.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    assert win._db_ro.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    win.close()
+
+
+def test_load_history_fetches_only_visible_rows(app, tmp_path, monkeypatch):
+    """History loading stops at the model's row cap."""
+    monkeypatch.setattr("ZPLWeb.main.user_data_dir", lambda *a, **k: tmp_path)
+    win = MainWindow()
+    win.history = PrintHistoryModel(maxlen=2)
+    win.history_loaded.disconnect()
+    rows = []
+    win.history_loaded.connect(rows.extend)
+    for i in range(5):
+        win._store_print(i + 1, f"INV{i}", 1, "^XA^XZ")
+
+    win._fetch_history()
+    assert rows == ["INV4  x1", "INV3  x1"]
+    win.close()
+
+
+def test_stored_zpl_is_compressed_and_round_trips(app, tmp_path, monkeypatch):
+    monkeypatch.setattr("ZPLWeb.main.user_data_dir", lambda *a, **k: tmp_path)
+    win = MainWindow()
+    zpl = b"^XA" + b"^FO50,50^A0N,30,30^FDHello^FS" * 40 + b"^XZ"
+    win._store_print(1, "INV", 2, zpl)
+    blob, codec = win._db_ro.execute("SELECT zpl, zpl_codec FROM prints").fetchone()
+
+    assert codec == main_module.ZPL_ZLIB and len(blob) < len(zpl) // 4
+    assert win._last_print("INV") == (zpl, 2)
+    win.close()
+
+
+def test_reprint_reads_rows_stored_before_compression(app, tmp_path, monkeypatch):
+    with sqlite3.connect(tmp_path / "prints.sqlite") as con:
+        con.execute(
+            "CREATE TABLE prints (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "job_id INTEGER, invoice TEXT, pcs INTEGER, zpl TEXT, tstamp TEXT, "
+            "acked INTEGER DEFAULT 0)"
+        )
+        con.execute(
+            "INSERT INTO prints (invoice, pcs, zpl) VALUES ('OLD', 1, '^XA^XZ')"
+        )
+        con.execute("PRAGMA user_version=1")
+    monkeypatch.setattr("ZPLWeb.main.user_data_dir", lambda *a, **k: tmp_path)
+    win = MainWindow()
+
+    assert win._last_print("OLD") == (b"^XA^XZ", 1)
+    win.close()
+
+
+def test_splitter_starts_at_quarter_width(app, tmp_path, monkeypatch):
+    monkeypatch.setattr("ZPLWeb.main.user_data_dir", lambda *a, **k: tmp_path)
+    win = MainWindow()
+    win.show()
+    app.processEvents()
+    left, right = win.splitter.sizes()
+    assert abs(left * 3 - right) <= 6
+    win.close()
+
+
+def test_history_not_loaded_after_close(app, tmp_path, monkeypatch):
+    """Closing before the deferred load fires never touches the closed DB."""
+    monkeypatch.setattr("ZPLWeb.main.user_data_dir", lambda *a, **k: tmp_path)
+    win = MainWindow()
+    fetched = []
+    monkeypatch.setattr(win, "_fetch_history", lambda: fetched.append(True))
+    win.close()
+
+    app.processEvents()
+    win._load_history()
+    win._bg_pool.waitForDone()
+    assert fetched == []
@@ -0,0 +1,39 @@
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from ZPLWeb.main import MainWindow
+
+
+@pytest.fixture(scope="module")
+def app():
+    """Provide a QApplication instance for widget tests."""
+    return QApplication.instance() or QApplication([])
+
+
+def test_log_lines_flushed_in_one_batch(app, tmp_path, monkeypatch):
+    """Log lines are buffered until the flush timer fires."""
+    monkeypatch.setattr("ZPLWeb.main.user_data_dir", lambda *a, **k: tmp_path)
+    win = MainWindow()
+    win.out.clear()
+    win.log_sig.emit("first")
+    win.log_sig.emit("second")
+    assert win.out.toPlainText() == ""
+
+    win._flush_log()
+    lines = win.out.toPlainText().splitlines()
+    assert [line.split("] ", 1)[1] for line in lines] == ["first", "second"]
+    win.close()
+
+
+def test_log_keeps_last_lines_only(app, tmp_path, monkeypatch):
+    """The log widget drops the oldest lines beyond LOG_MAX_LINES."""
+    monkeypatch.setattr("ZPLWeb.main.user_data_dir", lambda *a, **k: tmp_path)
+    monkeypatch.setattr("ZPLWeb.main.LOG_MAX_LINES", 3)
+    win = MainWindow()
+    for i in range(5):
+        win.log_sig.emit(f"line {i}")
+    win._flush_log()
+
+    lines = win.out.toPlainText().splitlines()
+    assert [line.split("] ", 1)[1] for line in lines] == ["line 2", "line 3", "line 4"]
+    win.close()
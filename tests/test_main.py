@@ -22,3 +22,98 @@ def test_second_instance_warns_and_exits(monkeypatch):
 
     warn_mock.assert_called_once()
     exit_mock.assert_called_once_with(0)
+
+
+def test_sanitize_key_strips_and_caps():
+    assert main_module._sanitize_key("  abc \n") == "abc"
+    long_key = "k" * (main_module.API_KEY_MAX_LEN + 10)
+    assert len(main_module._sanitize_key(long_key)) == main_module.API_KEY_MAX_LEN
+
+
+def test_options_save_writes_only_changed_keys(monkeypatch):
+    from PySide6.QtWidgets import QApplication
+
+    QApplication.instance() or QApplication([])
+    settings = MagicMock()
+    settings.value.side_effect = lambda key, default=None, **_: default
+    monkeypatch.setattr(main_module, "S", settings)
+    dlg = main_module.OptionsDialog()
+    dlg.api_edit.setText("new-key")
+    dlg._save()
+
+    settings.setValue.assert_called_once_with("api_key", "new-key")
+    assert settings.sync.call_count == 2  # one read refresh, one write flush
+
+
+def test_test_print_result_shown_on_gui_thread(monkeypatch):
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    info = MagicMock()
+    monkeypatch.setattr(main_module.QMessageBox, "information", info)
+    monkeypatch.setattr(main_module, "win32print", None)
+    dlg = main_module.TestPrintDialog(
+        printer_name="P1", submit=lambda fn, *args: fn(*args) or True
+    )
+    dlg.text_edit.setPlainText("^XA^XZ")
+    dlg._do_print()
+    info.assert_not_called()  # delivered through the queued signal
+
+    app.processEvents()
+    assert dlg.status_lbl.text() == "Skipped printed via P1"
+    info.assert_called_once()
+
+
+def test_ring_handler_writes_only_on_error():
+    import logging
+
+    target = MagicMock(spec=logging.Handler)
+    ring = main_module._RingHandler(2, logging.ERROR, target)
+    log = logging.getLogger("zplweb-test-ring")
+    log.propagate = False
+    log.setLevel(logging.DEBUG)
+    log.addHandler(ring)
+    for i in range(5):
+        log.debug("line %d", i)
+    target.handle.assert_not_called()
+
+    log.error("boom")
+    assert [c.args[0].getMessage() for c in target.handle.call_args_list] == [
+        "line 4",
+        "boom",
+    ]
+    log.removeHandler(ring)
+
+
+def test_debug_lines_written_to_agent_log_on_error(tmp_path):
+    import logging
+
+    root = logging.getLogger()
+    level, handlers = main_module.logger.level, root.handlers[:]
+    try:
+        main_module._setup_logging(tmp_path)
+        main_module.logger.debug("job 7 received")
+        assert not (tmp_path / "agent.log").exists()
+
+        main_module.logger.error("print failed")
+        text = (tmp_path / "agent.log").read_text(encoding="utf-8")
+        assert "DEBUG job 7 received" in text and "ERROR print failed" in text
+    finally:
+        for handler in root.handlers[len(handlers) :]:
+            root.removeHandler(handler)
+            handler.target.close()
+            handler.close()
+        main_module.logger.setLevel(level)
+
+
+def test_corrupt_numeric_prefs_fall_back_to_defaults(monkeypatch):
+    stored = {"reconnect_min_ms": "soon", "write_chunk_bytes": "4096"}
+    settings = MagicMock()
+    settings.value.side_effect = lambda key, default=None, **_: stored.get(
+        key, default
+    )
+    monkeypatch.setattr(main_module, "S", settings)
+
+    prefs = main_module._read_prefs()
+    assert prefs["reconnect_min_ms"] == main_module.RECONNECT_MIN_MS
+    assert prefs["write_chunk_bytes"] == 4096
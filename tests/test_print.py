@@ -0,0 +1,89 @@
+"""Tests for the printer session used by the print worker."""
+
+import ctypes
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("PySide6.QtWidgets")
+import ZPLWeb.main as main_module
+
+
+@pytest.fixture
+def fake_win32print(monkeypatch):
+    """Install a stand-in ``win32print`` module and a fresh printer session."""
+    fake = MagicMock()
+    fake.OpenPrinter.side_effect = lambda name: f"handle:{name}"
+    monkeypatch.setattr(main_module, "win32print", fake)
+    monkeypatch.setattr(main_module, "_PRINTER", main_module._PrinterSession())
+    return fake
+
+
+def test_handle_reused_between_jobs(fake_win32print):
+    cb = MagicMock()
+    main_module._print_zpl("P1", b"^XA^XZ", cb)
+    main_module._print_zpl("P1", b"^XA^XZ", cb)
+
+    fake_win32print.OpenPrinter.assert_called_once_with("P1")
+    fake_win32print.ClosePrinter.assert_not_called()
+    assert fake_win32print.WritePrinter.call_count == 2
+    cb.assert_called_with(True, "Printed via P1")
+
+
+def test_handle_reopened_after_failure(fake_win32print):
+    cb = MagicMock()
+    fake_win32print.WritePrinter.side_effect = [OSError("gone"), None]
+    main_module._print_zpl("P1", b"^XA^XZ", cb)
+    cb.assert_called_with(False, "Print error: gone")
+    fake_win32print.ClosePrinter.assert_called_once_with("handle:P1")
+
+    main_module._print_zpl("P1", b"^XA^XZ", cb)
+    assert fake_win32print.OpenPrinter.call_count == 2
+    cb.assert_called_with(True, "Printed via P1")
+
+
+def test_idle_handle_closed(fake_win32print):
+    cb = MagicMock()
+    main_module._print_zpl("P1", b"^XA^XZ", cb)
+    last = main_module._PRINTER._last_used
+
+    main_module._PRINTER.close_if_idle(now=last + 1)
+    fake_win32print.ClosePrinter.assert_not_called()
+
+    main_module._PRINTER.close_if_idle(now=last + main_module.PRINTER_IDLE_S + 1)
+    fake_win32print.ClosePrinter.assert_called_once_with("handle:P1")
+    main_module._print_zpl("P1", b"^XA^XZ", cb)
+    assert fake_win32print.OpenPrinter.call_count == 2
+
+
+def test_large_payload_written_in_chunks(fake_win32print):
+    main_module._PRINTER.chunk_size = 4
+    main_module._print_zpl("P1", b"^XA^FDhi^XZ", MagicMock())
+
+    chunks = [c.args[1] for c in fake_win32print.WritePrinter.call_args_list]
+    assert chunks == [b"^XA^", b"FDhi", b"^XZ"]
+
+
+def test_ctypes_writer_sends_slices_in_place(fake_win32print, monkeypatch):
+    """With winspool available, slices are written from the original buffer."""
+    seen = []
+
+    def fake_write(handle, ptr, n, written):
+        seen.append(ctypes.string_at(ptr, n))
+        written._obj.value = min(n, 3)  # spooler takes a partial slice
+        return True
+
+    monkeypatch.setattr(main_module, "_WritePrinter", fake_write)
+    fake_win32print.OpenPrinter.side_effect = lambda name: 42
+    main_module._PRINTER.chunk_size = 4
+    main_module._print_zpl("P1", b"^XA^FDhi^XZ", MagicMock())
+
+    assert b"".join(chunk[:3] for chunk in seen) == b"^XA^FDhi^XZ"
+    fake_win32print.WritePrinter.assert_not_called()
+
+
+def test_close_releases_handle(fake_win32print):
+    main_module._print_zpl("P1", b"^XA^XZ", MagicMock())
+    main_module._PRINTER.close()
+    main_module._PRINTER.close()
+    fake_win32print.ClosePrinter.assert_called_once_with("handle:P1")
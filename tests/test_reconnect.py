@@ -0,0 +1,95 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+import ZPLWeb.main as main_module
+from ZPLWeb.main import MainWindow
+
+
+@pytest.fixture(scope="module")
+def app():
+    """Provide a QApplication instance for widget tests."""
+    return QApplication.instance() or QApplication([])
+
+
+def test_reconnect_backs_off_exponentially(app, tmp_path, monkeypatch):
+    """Failed reconnects double the retry delay up to the ceiling."""
+    monkeypatch.setattr("ZPLWeb.main.user_data_dir", lambda *a, **k: tmp_path)
+    win = MainWindow()
+    # every attempt fails, reported back the way _do_connect does
+    monkeypatch.setattr(win, "_connect_socket", win._on_gui_disconnected)
+    win.api_key, win.server_url = "key", "http://example.invalid"
+    jitter = 1 + main_module.RECONNECT_JITTER
+
+    intervals = []
+    for _ in range(10):
+        win._reconnect_timer.stop()  # as if the previous retry just fired
+        win._reconnect_tick()
+        assert win._reconnect_timer.isActive()
+        intervals.append(win._reconnect_timer.interval())
+
+    assert intervals[0] <= main_module.RECONNECT_MIN_MS * jitter
+    assert intervals[-1] >= main_module.RECONNECT_MAX_MS * (2 - jitter)
+    assert all(i <= main_module.RECONNECT_MAX_MS * jitter for i in intervals)
+
+    win._on_gui_connected()
+    assert not win._reconnect_timer.isActive()
+    assert win._attempt == 0
+    win.close()
+
+
+def test_pending_retry_is_not_rescheduled(app, tmp_path, monkeypatch):
+    """Repeated disconnect signals don't push the pending retry back."""
+    monkeypatch.setattr("ZPLWeb.main.user_data_dir", lambda *a, **k: tmp_path)
+    win = MainWindow()
+    win._on_gui_disconnected()
+    win._on_gui_disconnected()
+
+    assert win._attempt == 1
+    win.close()
+
+
+def test_saving_options_cancels_pending_retry(app, tmp_path, monkeypatch):
+    """New settings reconnect immediately instead of waiting out the backoff."""
+    monkeypatch.setattr("ZPLWeb.main.user_data_dir", lambda *a, **k: tmp_path)
+    monkeypatch.setattr(main_module, "OptionsDialog", MagicMock())
+    win = MainWindow()
+    connects = []
+    win._reconnect.disconnect()
+    win._reconnect.connect(lambda: connects.append(win._reconnect_timer.isActive()))
+    for _ in range(3):
+        win._reconnect_timer.stop()
+        win._on_gui_disconnected()
+
+    win._open_options()
+    assert connects == [False]
+    assert win._attempt == 0
+    win.close()
+
+
+def test_connect_runs_off_the_gui_thread(app, tmp_path, monkeypatch):
+    """A slow or failing handshake never blocks the GUI thread."""
+    monkeypatch.setattr("ZPLWeb.main.user_data_dir", lambda *a, **k: tmp_path)
+    win = MainWindow()
+    app.processEvents()  # let the startup connect pass while no key is set
+    win.api_key, win.server_url = "key", "http://example.invalid"
+    calls = []
+
+    def fail(url, **kwargs):
+        calls.append((url, kwargs["wait_timeout"], threading.get_ident()))
+        raise ConnectionError("refused")
+
+    monkeypatch.setattr(win.sio, "connect", fail)
+    win._connect_socket()
+    win._bg_pool.waitForDone()
+    app.processEvents()
+
+    [(url, timeout, thread)] = calls
+    assert url == "http://example.invalid"
+    assert timeout == main_module.CONNECT_TIMEOUT_S
+    assert thread != threading.get_ident()
+    assert not win._connecting
+    assert win._reconnect_timer.isActive()  # failure scheduled a retry
+    win.close()
@@ -1,67 +1,58 @@
 """Tests for single-instance behavior."""
 
-import importlib
+import os
 import sys
 import tempfile
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 
-import ZPLWeb.utils as utils
+import pytest
 
+import ZPLWeb.utils as utils
 
-def test_existing_instance_brought_to_front(monkeypatch):
-    monkeypatch.setattr(sys, "platform", "win32")
-    fake_modules = {
-        "win32event": SimpleNamespace(CreateMutex=MagicMock()),
-        "win32api": SimpleNamespace(GetLastError=MagicMock(return_value=1)),
-        "win32con": SimpleNamespace(SW_RESTORE=9),
-        "win32gui": SimpleNamespace(
-            FindWindow=MagicMock(return_value=42),
-            ShowWindow=MagicMock(),
-            SetForegroundWindow=MagicMock(),
-        ),
-        "winerror": SimpleNamespace(ERROR_ALREADY_EXISTS=1),
-    }
-    monkeypatch.setitem(sys.modules, "win32event", fake_modules["win32event"])
-    monkeypatch.setitem(sys.modules, "win32api", fake_modules["win32api"])
-    monkeypatch.setitem(sys.modules, "win32con", fake_modules["win32con"])
-    monkeypatch.setitem(sys.modules, "win32gui", fake_modules["win32gui"])
-    monkeypatch.setitem(sys.modules, "winerror", fake_modules["winerror"])
 
-    assert utils.ensure_single_instance("T") is False
-    fake_modules["win32event"].CreateMutex.assert_called_with(
+@pytest.fixture
+def fake_win32(monkeypatch):
+    """Install stand-in pywin32 modules whose mutex reports ``last_error``."""
+
+    def _make(last_error):
+        get_last_error = MagicMock(return_value=last_error)
+        mods = {
+            "win32event": SimpleNamespace(CreateMutex=MagicMock()),
+            "win32api": SimpleNamespace(GetLastError=get_last_error),
+            "win32con": SimpleNamespace(SW_RESTORE=9),
+            "win32gui": SimpleNamespace(
+                FindWindow=MagicMock(return_value=42),
+                ShowWindow=MagicMock(),
+                SetForegroundWindow=MagicMock(),
+            ),
+            "winerror": SimpleNamespace(ERROR_ALREADY_EXISTS=1),
+        }
+        monkeypatch.setattr(sys, "platform", "win32")
+        for name, mod in mods.items():
+            monkeypatch.setitem(sys.modules, name, mod)
+        return mods
+
+    return _make
+
+
+@pytest.mark.parametrize("last_error, expected", [(1, False), (0, True)])
+def test_win32_mutex(fake_win32, last_error, expected):
+    """A held mutex brings the running window forward; a new one is kept."""
+    mods = fake_win32(last_error)
+
+    assert utils.ensure_single_instance("T") is expected
+    mods["win32event"].CreateMutex.assert_called_with(
         None, False, "Global\\ZPLWebSingleton"
     )
-    fake_modules["win32gui"].FindWindow.assert_called_with(None, "T")
-    fake_modules["win32gui"].ShowWindow.assert_called_with(42, 9)
-    fake_modules["win32gui"].SetForegroundWindow.assert_called_with(42)
-
-
-def test_primary_instance(monkeypatch):
-    monkeypatch.setattr(sys, "platform", "win32")
-    fake_modules = {
-        "win32event": SimpleNamespace(CreateMutex=MagicMock()),
-        "win32api": SimpleNamespace(GetLastError=MagicMock(return_value=0)),
-        "win32con": SimpleNamespace(SW_RESTORE=9),
-        "win32gui": SimpleNamespace(
-            FindWindow=MagicMock(return_value=42),
-            ShowWindow=MagicMock(),
-            SetForegroundWindow=MagicMock(),
-        ),
-        "winerror": SimpleNamespace(ERROR_ALREADY_EXISTS=1),
-    }
-    monkeypatch.setitem(sys.modules, "win32event", fake_modules["win32event"])
-    monkeypatch.setitem(sys.modules, "win32api", fake_modules["win32api"])
-    monkeypatch.setitem(sys.modules, "win32con", fake_modules["win32con"])
-    monkeypatch.setitem(sys.modules, "win32gui", fake_modules["win32gui"])
-    monkeypatch.setitem(sys.modules, "winerror", fake_modules["winerror"])
-
-    assert utils.ensure_single_instance("T") is True
-    fake_modules["win32event"].CreateMutex.assert_called_with(
-        None, False, "Global\\ZPLWebSingleton"
-    )
-    fake_modules["win32gui"].FindWindow.assert_not_called()
-    assert utils._SINGLETON_MUTEX == fake_modules["win32event"].CreateMutex.return_value
+    gui = mods["win32gui"]
+    if expected:
+        gui.FindWindow.assert_not_called()
+        assert utils._SINGLETON_MUTEX == mods["win32event"].CreateMutex.return_value
+    else:
+        gui.FindWindow.assert_called_with(None, "T")
+        gui.ShowWindow.assert_called_with(42, 9)
+        gui.SetForegroundWindow.assert_called_with(42)
 
 
 def test_file_lock_fallback(monkeypatch, tmp_path):
@@ -70,10 +61,14 @@ def test_file_lock_fallback(monkeypatch, tmp_path):
     monkeypatch.setattr(sys, "platform", "linux")
     lock_file = tmp_path / "lock"
     monkeypatch.setattr(utils, "_LOCK_FILE", lock_file)
+    monkeypatch.setattr(utils, "_LOCK_FD", None)
 
     assert utils.ensure_single_instance("T") is True
     assert utils.ensure_single_instance("T") is False
-    lock_file.unlink(missing_ok=True)
+
+    os.close(utils._LOCK_FD)  # as if the first instance exited or crashed
+    assert utils.ensure_single_instance("T") is True
+    os.close(utils._LOCK_FD)
 
 
 def test_lock_file_path_in_frozen_app(monkeypatch, tmp_path):
@@ -84,8 +79,4 @@ def test_lock_file_path_in_frozen_app(monkeypatch, tmp_path):
     monkeypatch.setattr(tempfile, "gettempdir", lambda: str(mei_dir))
     monkeypatch.setattr(sys, "frozen", True, raising=False)
 
-    importlib.reload(utils)
-    try:
-        assert utils._LOCK_FILE == tmp_path / "ZPLWeb.lock"
-    finally:
-        importlib.reload(utils)
+    assert utils._lock_file_path() == tmp_path / "ZPLWeb.lock"
@@ -1,20 +1,60 @@
 import os
 import types
-from importlib import reload
+from collections import OrderedDict
+
+import pytest
 
 import ZPLWeb.utils as utils
 
 
-def test_resource_path_frozen(tmp_path, monkeypatch):
-    mod = reload(utils)
-    monkeypatch.setattr(
-        mod, "sys", types.SimpleNamespace(frozen=True, _MEIPASS=str(tmp_path))
+@pytest.fixture
+def fresh_resource_path():
+    """Clear ``resource_path``'s cache around a test that patches ``sys``."""
+    utils.resource_path.cache_clear()
+    yield utils.resource_path
+    utils.resource_path.cache_clear()
+
+
+@pytest.mark.parametrize("frozen", [True, False], ids=["frozen", "dev"])
+def test_resource_path(frozen, tmp_path, monkeypatch, fresh_resource_path):
+    if frozen:
+        fake_sys = types.SimpleNamespace(frozen=True, _MEIPASS=str(tmp_path))
+        base = str(tmp_path)
+    else:
+        fake_sys = types.SimpleNamespace(frozen=False)
+        base = os.path.abspath(os.path.dirname(utils.__file__))
+    monkeypatch.setattr(utils, "sys", fake_sys)
+    assert fresh_resource_path("foo") == os.path.join(base, "foo")
+
+
+@pytest.mark.parametrize(
+    "stamps, now, expected",
+    [
+        ([("a", 0.0), ("b", 10.0)], 12.0, ["b"]),
+        ([], 12.0, []),
+        ([("a", 5.0)], 10.0, []),  # exactly ttl old has expired
+        ([("a", 5.5)], 10.0, ["a"]),
+        ([("a", 0.0), ("b", 1.0)], 12.0, []),
+        ([("a", 8.0), ("b", 9.0)], 12.0, ["a", "b"]),
+    ],
+)
+def test_expire_stale_jobs(stamps, now, expected):
+    store = OrderedDict(stamps)
+    utils.expire_stale_jobs(store, ttl=5, now=now)
+    assert list(store) == expected
+
+
+def test_make_fingerprint_separates_fields():
+    assert utils._make_fingerprint("ab", None, "c") != utils._make_fingerprint(
+        "a", None, "bc"
+    )
+    assert utils._make_fingerprint("INV", 2, "^XA") == utils._make_fingerprint(
+        "INV", 2, b"^XA"
     )
-    assert mod.resource_path("foo") == os.path.join(str(tmp_path), "foo")
 
 
-def test_resource_path_dev(monkeypatch):
-    mod = reload(utils)
-    monkeypatch.setattr(mod, "sys", types.SimpleNamespace(frozen=False))
-    expected = os.path.join(os.path.abspath(os.path.dirname(mod.__file__)), "bar")
-    assert mod.resource_path("bar") == expected
+def test_make_fingerprint_fallback_matches_width(monkeypatch):
+    """Both hash backends return a 128-bit int."""
+    monkeypatch.setattr(utils, "xxhash", None)
+    fp = utils._make_fingerprint("INV", 2, b"^XA")
+    assert isinstance(fp, int) and fp.bit_length() <= 128